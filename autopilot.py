@@ -0,0 +1,254 @@
+"""
+Autopilot: dispatches events between incoming, queued and active for the
+player (main.py, A toggles it) or for headless comparison runs:
+
+    python autopilot.py --missions 50
+    python autopilot.py --policies edf weighted --spawn-interval 1.5 --queue-limit 2
+
+Each policy is a sort key. Candidates sit in one heap per list, so each
+decision costs O(log n) whatever the backlog. Free active slots go to the
+best event across both lists (incoming is honored, queued executed), and
+the best incoming events that don't get a slot are queued, up to
+queue_limit, so they cannot expire.
+
+Comparisons default to a spawn every COMPARE_SPAWN_INTERVAL seconds: at the
+game's own rate five active slots keep up with every event, so all
+policies play the same missions and tie.
+"""
+import time, argparse
+from heapq import heappush, heappop, heapify
+
+from events import INCOMING, ACTIVE, QUEUED
+from simulation import Simulation, SimConfig, MISSION_TIME, SPAWN_INTERVAL, TICK_RATE
+from sweep import DEFAULT_SKILL, QUEUE_LIMIT, idle, play_mission
+
+COMPARE_SPAWN_INTERVAL = 2.0  # loaded enough that the policies' choices matter
+
+# ----------------------------
+# Policies
+# ----------------------------
+# key(ev, deadline) -> sort key, smallest first. deadline is the store
+# clock plus expire_time when the event entered its list: when an incoming
+# event expires, and for a queued one when it would have. Keys only change
+# when an event moves or its priority is edited, which re-files it.
+
+def edf(ev, deadline):
+    """Earliest deadline first."""
+    return (deadline, ev.id)
+
+def priority(ev, deadline):
+    """Highest Event.priority first (as set with the M/N keys), then earliest deadline."""
+    return (-ev.priority, deadline, ev.id)
+
+def weighted(ev, deadline):
+    """Most benefit plus impact at stake per second of active slot, then earliest deadline."""
+    return (-(ev.benefit + ev.impact) / ev.total_duration, deadline, ev.id)
+
+POLICIES = {"edf": edf, "priority": priority, "weighted": weighted}
+
+# ----------------------------
+# Dispatcher
+# ----------------------------
+class Autopilot:
+    """
+    Called once per simulation step; returns the (name, event_id) actions
+    to feed into that step. It learns about new spawns from the event id
+    counter, and about moves it didn't decide through touch(). Stale heap
+    entries are skipped when they surface and compacted away when they
+    outnumber live ones.
+    """
+
+    def __init__(self, policy="edf", honor=True, queue_limit=QUEUE_LIMIT):
+        self.policy = policy
+        self.key = POLICIES[policy]
+        self.honor = honor  # False: only executes from the queue and queues incoming
+        # Queued events never expire, so queuing everything would make every
+        # policy keep everything and leave nothing for the policy to decide
+        self.queue_limit = queue_limit
+        self.state = None
+        self.decisions = 0
+        self.actions = {"honor": 0, "execute": 0, "queue": 0}
+        self.cost = 0.0  # seconds spent deciding
+
+    def reset(self, state):
+        self.state = state
+        self.heaps = {INCOMING: [], QUEUED: []}  # (key, event_id)
+        self.filed = {}     # event_id -> (list_name, key) of its live heap entry
+        self.entered = {}   # event_id -> (list_name, deadline) fixed when it entered that list
+        self.next_id = 1    # lowest event id not yet filed
+        self.touched = []   # ids to re-file at the next decision
+
+    def touch(self, event_id):
+        """Marks an event whose list or priority may have changed, e.g. by a player action."""
+        if self.state is not None:
+            self.touched.append(event_id)
+
+    def __call__(self, sim):
+        start = time.perf_counter()
+        s = sim.state
+        if s is not self.state:
+            self.reset(s)  # new or resumed session
+        events = s.events
+        for event_id in range(self.next_id, s.event_id_counter):
+            self._file(events, event_id)
+        self.next_id = s.event_id_counter
+        for event_id in self.touched:
+            self._file(events, event_id)
+        self.touched = []
+
+        actions = []
+        cfg = sim.config
+        free = cfg.max_active - events.count(ACTIVE)
+        while free > 0:
+            incoming = self._peek(events, INCOMING) if self.honor else None
+            queued = self._peek(events, QUEUED)
+            if incoming is None and queued is None:
+                break
+            if queued is None or (incoming is not None and incoming < queued):
+                actions.append(("honor", self._pop(INCOMING)))
+            else:
+                actions.append(("execute", self._pop(QUEUED)))
+            free -= 1
+
+        limit = self.queue_limit if cfg.max_queued is None else min(self.queue_limit, cfg.max_queued)
+        room = limit - events.count(QUEUED)
+        while room > 0 and self._peek(events, INCOMING) is not None:
+            actions.append(("queue", self._pop(INCOMING)))
+            room -= 1
+
+        for name, event_id in actions:
+            self.actions[name] += 1
+            self.touched.append(event_id)  # re-filed where it lands once the step applies it
+        self.decisions += 1
+        self.cost += time.perf_counter() - start
+        return actions
+
+    # ---------- Heaps ----------
+
+    def _file(self, events, event_id):
+        list_name = events.location(event_id)
+        if list_name not in self.heaps:
+            self.filed.pop(event_id, None)  # active, or gone
+            self.entered.pop(event_id, None)
+            return
+        ev = events.get(event_id)
+        entered = self.entered.get(event_id)
+        if entered is None or entered[0] != list_name:
+            entered = self.entered[event_id] = (list_name, events.clock + ev.expire_time)
+        key = self.key(ev, entered[1])
+        if self.filed.get(event_id) == (list_name, key):
+            return
+        self.filed[event_id] = (list_name, key)
+        heappush(self.heaps[list_name], (key, event_id))
+        entries = len(self.heaps[INCOMING]) + len(self.heaps[QUEUED])
+        if entries > 64 and entries > 2 * (events.count(INCOMING) + events.count(QUEUED)):
+            self._compact(events)
+
+    def _peek(self, events, list_name):
+        """Key of the best live event in a list, dropping stale entries on the way."""
+        heap = self.heaps[list_name]
+        while heap:
+            key, event_id = heap[0]
+            if self.filed.get(event_id) == (list_name, key) and events.location(event_id) == list_name:
+                return key
+            heappop(heap)
+            if self.filed.get(event_id, (None,))[0] == list_name and events.location(event_id) is None:
+                del self.filed[event_id]  # expired or completed
+                self.entered.pop(event_id, None)
+        return None
+
+    def _pop(self, list_name):
+        _, event_id = heappop(self.heaps[list_name])
+        del self.filed[event_id]
+        return event_id
+
+    def _compact(self, events):
+        """Rebuilds the heaps from live entries; amortised O(1) per push."""
+        for list_name, heap in self.heaps.items():
+            heap[:] = [(key, event_id) for key, event_id in heap
+                       if self.filed.get(event_id) == (list_name, key) and events.location(event_id) == list_name]
+            heapify(heap)
+        self.filed = {event_id: (list_name, key) for list_name, heap in self.heaps.items() for key, event_id in heap}
+        self.entered = {event_id: self.entered[event_id] for event_id in self.filed}
+
+    def stats(self):
+        return {"policy": self.policy, "decisions": self.decisions, **self.actions,
+                "decide_us": self.cost / max(1, self.decisions) * 1e6}
+
+# ----------------------------
+# Policy comparison
+# ----------------------------
+def run_mission(policy, seed, mission_time=MISSION_TIME, config=None, skill=DEFAULT_SKILL, tick_rate=TICK_RATE,
+                queue_limit=QUEUE_LIMIT):
+    """
+    Plays one mission with a policy (None plays nothing) through
+    sweep.play_mission. Returns its score, health, seconds played and counts
+    of spawned, missed and completed events.
+    """
+    sim = Simulation(mission_time, seed=seed, config=config)
+    outcome = {"expired": 0, "completed": 0}
+    def count(kind, **fields):
+        if kind in outcome:
+            outcome[kind] += 1
+    sim.telemetry = count
+    pilot = Autopilot(policy, queue_limit=queue_limit) if policy else None
+    state = play_mission(sim, pilot or idle, seed, skill, tick_rate)
+    return {"score": state.score, "health": state.health, "elapsed": state.elapsed,
+            "spawned": state.spawned, "missed": outcome["expired"], "completed": outcome["completed"],
+            "decide_us": pilot.stats()["decide_us"] if pilot else 0.0}
+
+def compare(policies, missions, seed=0, mission_time=MISSION_TIME, config=None, skill=DEFAULT_SKILL,
+            tick_rate=TICK_RATE, queue_limit=QUEUE_LIMIT):
+    """
+    Per policy throughput over the same seeds. Misses avoided compares the
+    rate of expired events (per minute survived) with not playing at all.
+    """
+    baseline = [run_mission(None, s, mission_time, config, skill, tick_rate) for s in range(seed, seed + missions)]
+    idle_rate = sum(r["missed"] for r in baseline) / sum(r["elapsed"] for r in baseline)
+    rows = []
+    for policy in policies:
+        runs = [run_mission(policy, s, mission_time, config, skill, tick_rate, queue_limit)
+                for s in range(seed, seed + missions)]
+        minutes = sum(r["elapsed"] for r in runs) / 60
+        missed = sum(r["missed"] for r in runs)
+        rows.append({
+            "policy": policy,
+            "missions": missions,
+            "survival_rate": sum(r["health"] > 0 for r in runs) / missions,
+            "score_per_min": sum(r["score"] for r in runs) / minutes,
+            "completed_per_min": sum(r["completed"] for r in runs) / minutes,
+            "missed_per_min": missed / minutes,
+            "misses_avoided": 1 - missed / minutes / 60 / idle_rate if idle_rate else None,
+            "decide_us": sum(r["decide_us"] for r in runs) / missions,
+        })
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare autopilot policies on headless missions")
+    parser.add_argument("--policies", nargs="+", choices=POLICIES, default=list(POLICIES))
+    parser.add_argument("--missions", type=int, default=20, help="missions per policy")
+    parser.add_argument("--seed", type=int, default=0, help="first mission seed")
+    parser.add_argument("--mission-time", type=int, default=MISSION_TIME)
+    parser.add_argument("--skill", type=float, default=DEFAULT_SKILL, help="chance a mini-game is won")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE)
+    parser.add_argument("--spawn-interval", type=float, default=COMPARE_SPAWN_INTERVAL,
+                        help=f"seconds between spawns (default {COMPARE_SPAWN_INTERVAL}; the game's is {SPAWN_INTERVAL})")
+    parser.add_argument("--max-queued", type=int, help="override SimConfig.max_queued")
+    parser.add_argument("--queue-limit", type=int, default=QUEUE_LIMIT, help="events the autopilot keeps queued")
+    args = parser.parse_args(argv)
+
+    overrides = {"spawn_interval": args.spawn_interval}
+    if args.max_queued is not None:
+        overrides["max_queued"] = args.max_queued
+    rows = compare(args.policies, args.missions, args.seed, args.mission_time, SimConfig(**overrides),
+                   args.skill, args.tick_rate, args.queue_limit)
+    for row in rows:
+        avoided = row["misses_avoided"]
+        print(f"{row['policy']:<9} n={row['missions']:<4} survive={row['survival_rate']:6.1%}  "
+              f"score/min={row['score_per_min']:6.1f}  completed/min={row['completed_per_min']:5.2f}  "
+              f"missed/min={row['missed_per_min']:5.2f}  "
+              f"misses avoided={'-' if avoided is None else f'{avoided:.1%}'}  "
+              f"decide={row['decide_us']:.1f}us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Benchmark suite for the simulation, rendering and mini-game loops.
+
+    python benchmarks.py                          # run everything, print results
+    python benchmarks.py --json out.json          # also write machine-readable results
+    python benchmarks.py --save-baseline base.json
+    python benchmarks.py --baseline base.json --threshold 0.25
+
+Metrics ending in _per_sec are higher-is-better, everything else (_us, _ms)
+is lower-is-better. With --baseline the run exits non-zero if any metric is
+worse than the baseline by more than --threshold (a fraction).
+"""
+import os, sys, json, random, time, argparse, contextlib, subprocess
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+from logs import generate_log, LogGenerator, CATEGORIES
+from events import generate_random_event, default_catalog, EventCatalog, EventStore, INCOMING, ACTIVE, QUEUED
+from simulation import Simulation, SimConfig
+
+def timeit(fn, repeat=5):
+    """Best wall time of fn() over several runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+@contextlib.contextmanager
+def patched(obj, attr, value):
+    old = getattr(obj, attr)
+    setattr(obj, attr, value)
+    try:
+        yield
+    finally:
+        setattr(obj, attr, old)
+
+# ----------------------------
+# Logs and events
+# ----------------------------
+def bench_logs(n=100_000):
+    """Records/sec for generate_log() vs the batched LogGenerator."""
+    random.seed(0)
+    single = timeit(lambda: [generate_log() for _ in range(n)])
+    gen = LogGenerator(rng=random.Random(0), batch_size=4096)
+    batched = timeit(lambda: gen.take(n))
+    return {
+        "generate_log_per_sec": n / single,
+        "log_generator_per_sec": n / batched,
+    }
+
+def bench_event_generation(n=100_000, templates=100_000):
+    """Events/sec one at a time, in bulk, and in bulk from a catalog of `templates` templates."""
+    rng = random.Random(0)
+    best = timeit(lambda: [generate_random_event(i, rng) for i in range(n)])
+    bulk = timeit(lambda: default_catalog().sample_many(n, 1, rng))
+    large = EventCatalog([{"name": f"Event {i}", "category": CATEGORIES[i % len(CATEGORIES)], "weight": 1 + i % 7}
+                          for i in range(templates)])
+    large_bulk = timeit(lambda: large.sample_many(n, 1, rng))
+    return {
+        "generate_random_event_per_sec": n / best,
+        "catalog_bulk_per_sec": n / bulk,
+        "large_catalog_bulk_per_sec": n / large_bulk,
+    }
+
+# ----------------------------
+# Simulation ticks
+# ----------------------------
+def _populate(sim, per_list, first_id=1, pinned=False):
+    """Adds per_list events to each list; pinned events never expire or complete."""
+    rng = random.Random(3)
+    next_id = first_id
+    for list_name in (INCOMING, ACTIVE, QUEUED):
+        for _ in range(per_list):
+            ev = generate_random_event(next_id, rng)
+            if pinned:
+                ev.expire_time = ev.duration = ev.total_duration = 1e6
+            sim.state.events.add(ev, list_name)
+            next_id += 1
+
+def run_ticks(sim, ticks):
+    """Steps a mission, honoring the oldest incoming event whenever there is room."""
+    state = sim.state
+    for _ in range(ticks):
+        actions = [("honor", ev.id) for ev in state.events.events(INCOMING, 1)]
+        sim.step(1/60, actions)
+        sim.resolve_pending()
+
+def bench_ticks(ticks=20_000, preload=500, repeat=3):
+    """
+    Spawn/expire/complete throughput, on an empty mission and with preload
+    pinned events in each list. Missions can't fail, so every timed tick is
+    a full step, and each run's Simulation is built before the clock starts.
+    """
+    results = {}
+    for label, preloaded in (("empty", 0), (f"{preload}_events", preload)):
+        sims = []
+        for _ in range(repeat):
+            sim = Simulation(None, seed=1, config=SimConfig(can_fail=False))
+            _populate(sim, preloaded, first_id=-3 * preloaded, pinned=True)  # ids clear of spawned ones
+            sims.append(sim)
+        results[f"sim_ticks_{label}_per_sec"] = ticks / timeit(lambda: run_ticks(sims.pop(), ticks), repeat)
+    return results
+
+def bench_stores(rates=(1000, 10000), warmup=20, seconds=5):
+    """
+    Tick cost with EventStore vs the NumPy EventTable at stress spawn rates,
+    timed after warmup simulated seconds, once expiries keep pace with spawns.
+    """
+    import event_table, stress
+    factories = {"store": EventStore}
+    if event_table.np is not None:
+        factories["table"] = event_table.EventTable
+    results = {}
+    for rate in rates:
+        for label, factory in factories.items():
+            config = SimConfig(spawn_interval=1 / rate, can_fail=False)
+            sim = Simulation(None, store_factory=factory, seed=1, config=config)
+            def run(ticks):
+                for _ in range(ticks):
+                    sim.step(1/60, stress.play(sim, 1))
+                    sim.resolve_pending()
+            run(warmup * 60)
+            ticks = seconds * 60
+            results[f"{label}_tick_{rate}_spawns_us"] = timeit(lambda: run(ticks), repeat=1) / ticks * 1e6
+    return results
+
+# ----------------------------
+# Rendering
+# ----------------------------
+def bench_render(sizes=(0, 8, 500), frames=200):
+    """draw_event_list and draw_ui frame times with N events in every list."""
+    import main
+    if main.WIN is None:
+        main.init_display()
+    results = {}
+    def resolve_now():
+        main.sim.resolve_minigame(main.sim.state.pending_minigames[0], True)
+
+    with patched(main, "trigger_minigame", resolve_now):
+        for n in sizes:
+            results.update(_render_sizes(main, n, frames))
+    return results
+
+def _render_sizes(main, n, frames):
+    main.reset_game(None, seed=1)
+    _populate(main.sim, n, first_id=-3 * n, pinned=True)
+    events = main.panel_events(INCOMING)
+    x = main.panel_x(0)
+
+    def event_list():
+        for _ in range(frames):
+            main.draw_event_list(events, "Incoming Events", x, main.PANEL_TOP,
+                                 INCOMING, main.incoming_rects)
+
+    def full_frame():
+        for _ in range(frames):
+            main.invalidate_ui()
+            main.draw_ui()
+
+    def steady_frame():
+        for _ in range(frames):
+            main.update_game(1/60)
+            main.draw_ui()
+
+    return {
+        f"draw_event_list_{n}_us": timeit(event_list, repeat=3) / frames * 1e6,
+        f"draw_ui_full_{n}_us": timeit(full_frame, repeat=3) / frames * 1e6,
+        f"draw_ui_steady_{n}_us": timeit(steady_frame, repeat=3) / frames * 1e6,
+    }
+
+# ----------------------------
+# Mini-games
+# ----------------------------
+def scripted_events(frame, every=30):
+    """Every `every` frames, a burst of inputs that ends or advances most mini-games."""
+    if frame % every:
+        return []
+    center = (pygame.display.get_surface().get_width() // 2,
+              pygame.display.get_surface().get_height() // 2)
+    return [
+        pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=center, button=1),
+        pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, unicode=" "),
+        pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN, unicode="\r"),
+    ]
+
+def bench_minigames(max_frames=3000):
+    """Per-frame cost (input + update + draw) of each mini-game scene with scripted input."""
+    import main, minigames
+    if main.WIN is None:
+        main.init_display()
+    results = {}
+    for mg in minigames.minigames:
+        random.seed(4)
+        scene = mg()
+        frames = 0
+        start = time.perf_counter()
+        while not scene.done and frames < max_frames:
+            for event in scripted_events(frames):
+                scene.handle_event(event)
+            scene.update(1/60)
+            scene.draw(main.WIN)
+            frames += 1
+        elapsed = time.perf_counter() - start
+        results[f"minigame_{mg.__name__}_frame_us"] = elapsed / max(1, frames) * 1e6
+    return results
+
+# ----------------------------
+# Startup
+# ----------------------------
+STARTUP_SCRIPT = """
+import main
+main.init_display()
+main.draw_menu()
+main.report_startup()
+print(main.startup_time)
+"""
+
+def bench_startup(runs=3):
+    """Launch-to-menu time of a fresh interpreter (imports, display, fonts, first frame)."""
+    best_process = best_menu = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], capture_output=True, text=True,
+                             check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        best_process = min(best_process, time.perf_counter() - start)
+        best_menu = min(best_menu, float(out.stdout.split()[-1]))
+    return {
+        "startup_process_ms": best_process * 1000,
+        "startup_to_menu_ms": best_menu * 1000,
+    }
+
+# ----------------------------
+# Runner
+# ----------------------------
+BENCHMARKS = {
+    "logs": bench_logs,
+    "events": bench_event_generation,
+    "ticks": bench_ticks,
+    "stores": bench_stores,
+    "render": bench_render,
+    "minigames": bench_minigames,
+    "startup": bench_startup,
+}
+
+def higher_is_better(metric):
+    return metric.endswith("_per_sec")
+
+def compare(results, baseline, threshold):
+    """Returns [(metric, baseline, current, change)] for metrics that regressed past threshold."""
+    regressions = []
+    for metric, base in baseline.items():
+        current = results.get(metric)
+        if current is None or not base:
+            continue
+        change = (current - base) / base
+        worse = -change if higher_is_better(metric) else change
+        if worse > threshold:
+            regressions.append((metric, base, current, change))
+    return regressions
+
+def run(names):
+    results = {}
+    for name in names:
+        results.update(BENCHMARKS[name]())
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS))
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a stored baseline")
+    parser.add_argument("--save-baseline", metavar="PATH", help="store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed regression as a fraction of the baseline (default 0.25)")
+    args = parser.parse_args(argv)
+
+    results = run(args.only)
+    for metric, value in results.items():
+        print(f"{metric:>40}: {value:,.2f}")
+
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for metric, base, current, change in regressions:
+            print(f"REGRESSION {metric}: {base:,.2f} -> {current:,.2f} ({change:+.0%})")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+"""
+Invariant checks for the parts of the game where a bug changes outcomes
+instead of crashing: the snapshot format, the NumPy event table, the
+autopilot's heaps, the tic-tac-toe table and the event sampler.
+
+    python checks.py                      # run everything
+    python checks.py --only snapshots     # just some of them
+
+Each check fails with an AssertionError saying what differed (or returns
+why it was skipped); the run exits non-zero if any check failed.
+"""
+import os, sys, time, random, argparse, tempfile
+
+import snapshot
+from events import LISTS
+from simulation import Simulation, SimConfig, ACTIONS
+
+SKILL = 0.7  # chance the checks' random player wins a mini-game
+
+def random_inputs(sim, rng, actions=3):
+    """Up to `actions` random player actions on random existing ids, valid or not."""
+    top = sim.state.event_id_counter
+    return [(rng.choice(ACTIONS), rng.randrange(1, top + 1)) for _ in range(rng.randrange(actions + 1))]
+
+# ----------------------------
+# Snapshots
+# ----------------------------
+def check_snapshots(seeds=range(4), before=900, after=1800):
+    """
+    A session restored from a snapshot evolves tick-for-tick like the
+    original: every tick after the restore both serialise to the same
+    bytes. Also covers the background writer and corrupt-file rejection.
+    """
+    for seed in seeds:
+        for mission_time in (300, None):
+            config = SimConfig(spawn_interval=0.5, can_fail=False)  # checkpoints are of running sessions
+            original = Simulation(mission_time, seed=seed, config=config)
+            inputs = random.Random(seed)
+            for _ in range(before):
+                original.step(1/60, random_inputs(original, inputs))
+                original.resolve_pending(inputs, SKILL)
+            resumed = snapshot.restore(Simulation(config=config), snapshot.dumps(original))
+            for tick in range(after):
+                actions = random_inputs(original, inputs)
+                outcomes = inputs.getstate()
+                for sim in (original, resumed):
+                    sim.step(1/60, actions)
+                    inputs.setstate(outcomes)
+                    sim.resolve_pending(inputs, SKILL)
+                assert snapshot.dumps(original) == snapshot.dumps(resumed), \
+                    f"seed {seed}, mission_time {mission_time}: diverged {tick + 1} ticks after the restore"
+
+    data = snapshot.dumps(original)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session.snap")
+        writer = snapshot.SnapshotWriter(path)
+        writer.submit(data)
+        writer.flush()
+        writer.close()
+        assert snapshot.dumps(snapshot.load(Simulation(), path)) == data, "written snapshot reads back differently"
+    for bad, reason in ((data[:-1], "truncated"), (data[:20] + bytes([data[20] ^ 1]) + data[21:], "bit flip")):
+        try:
+            snapshot.restore(Simulation(), bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"{reason} snapshot was accepted")
+
+# ----------------------------
+# Event stores
+# ----------------------------
+def check_stores(seeds=range(3), ticks=3000):
+    """
+    A Simulation on the NumPy EventTable plays exactly like one on
+    EventStore: same logs, lists and snapshot bytes every tick. Skipped
+    without numpy.
+    """
+    import event_table
+    from events import EventStore
+    if event_table.np is None:
+        return "skipped (no numpy)"
+    for seed in seeds:
+        config = dict(spawn_interval=0.05, max_queued=6, can_fail=False)
+        sims = [Simulation(None, factory, seed=seed, config=SimConfig(**config))
+                for factory in (EventStore, event_table.EventTable)]
+        inputs = random.Random(seed)
+        for tick in range(ticks):
+            actions = random_inputs(sims[0], inputs)
+            outcomes = inputs.getstate()
+            for sim in sims:
+                sim.step(1/60, actions)
+                inputs.setstate(outcomes)
+                sim.resolve_pending(inputs, SKILL)
+            store, table = sims
+            assert [e.message for e in store.state.logs] == [e.message for e in table.state.logs], \
+                f"seed {seed}: logs differ at tick {tick}"
+            assert [ev.id for name in LISTS for ev in store.state.events.events(name)] == \
+                   [ev.id for name in LISTS for ev in table.state.events.events(name)], \
+                f"seed {seed}: lists differ at tick {tick}"
+            if tick % 100 == 0:
+                assert snapshot.dumps(store) == snapshot.dumps(table), f"seed {seed}: snapshots differ at tick {tick}"
+
+# ----------------------------
+# Tic-tac-toe
+# ----------------------------
+def check_tictactoe():
+    """
+    The perfect tier never loses: every sequence of player moves against
+    every best move in the table ends in a draw or an opponent win. Board
+    tracks winners like a full scan of the lines, and the table reads back
+    from its cache file unchanged.
+    """
+    import tictactoe
+    from tictactoe import Board, X, O, LINES, CELLS, EMPTY
+
+    table = tictactoe.solve()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tictactoe.bin")
+        tictactoe.save_table(table, path)
+        assert tictactoe.load_table(path) == table, "cached table reads back differently"
+
+    def board_after(moves):
+        board = Board()
+        for cell, mark in moves:
+            board.play(cell, mark)
+        scanned = [mark for mark in (X, O) if any(all(board.cells[i] == mark for i in line) for line in LINES)]
+        assert scanned == ([] if board.winner is None else [board.winner]), \
+            f"Board.winner is {board.winner} but the lines say {scanned} on {board.cells}"
+        return board
+
+    outcomes = {X: 0, O: 0, None: 0}
+    def play(moves):
+        # The player (X) tries every empty cell, the opponent every best reply
+        board = board_after(moves)
+        for cell in board.empties():
+            after = board_after(moves + [(cell, X)])
+            if after.over:
+                outcomes[after.winner] += 1
+                continue
+            mask = table[after.code]
+            assert mask, f"no move for the opponent on {after.cells}"
+            for reply in range(CELLS):
+                if mask >> reply & 1:
+                    assert after.cells[reply] == EMPTY, f"the table picks a taken cell on {after.cells}"
+                    final = board_after(moves + [(cell, X), (reply, O)])
+                    if final.over:
+                        outcomes[final.winner] += 1
+                    else:
+                        play(moves + [(cell, X), (reply, O)])
+
+    play([])
+    assert outcomes[X] == 0, f"the player beat the perfect tier in {outcomes[X]} games"
+
+# ----------------------------
+# Autopilot
+# ----------------------------
+def brute_force_dispatch(sim, key, entered, queue_limit):
+    """
+    What the autopilot should do, found by sorting every candidate from
+    scratch. entered maps event id -> (list, deadline) as it first saw them.
+    """
+    from events import INCOMING, ACTIVE, QUEUED
+    events = sim.state.events
+    ranked = {}
+    for list_name in (INCOMING, QUEUED):
+        candidates = []
+        for ev in events.events(list_name):
+            if entered.get(ev.id, (None,))[0] != list_name:
+                entered[ev.id] = (list_name, events.clock + ev.expire_time)
+            candidates.append((key(ev, entered[ev.id][1]), ev.id))
+        ranked[list_name] = sorted(candidates)
+    incoming, queued = ranked[INCOMING], ranked[QUEUED]
+    cfg = sim.config
+    actions = []
+    free = cfg.max_active - events.count(ACTIVE)
+    while free > 0 and (incoming or queued):
+        if not queued or (incoming and incoming[0] < queued[0]):
+            actions.append(("honor", incoming.pop(0)[1]))
+        else:
+            actions.append(("execute", queued.pop(0)[1]))
+        free -= 1
+    limit = queue_limit if cfg.max_queued is None else min(queue_limit, cfg.max_queued)
+    for _ in range(limit - events.count(QUEUED)):
+        if incoming:
+            actions.append(("queue", incoming.pop(0)[1]))
+    return actions
+
+def check_autopilot(steps=20_000):
+    """
+    The heap dispatcher picks exactly what a full sort would, step after
+    step, with random player moves and priority edits in between (touched,
+    as main.py does) and stale entries piling up and being compacted.
+    """
+    from autopilot import Autopilot, POLICIES
+    runs = [(policy, max_queued) for policy in POLICIES for max_queued in (None, 2)]
+    for run, (policy, max_queued) in enumerate(runs):
+        sim = Simulation(None, seed=run, config=SimConfig(spawn_interval=0.4, max_queued=max_queued, can_fail=False))
+        pilot = Autopilot(policy)
+        inputs = random.Random(run)
+        entered = {}
+        for step in range(steps // len(runs)):
+            manual = random_inputs(sim, inputs, actions=2)
+            expected = brute_force_dispatch(sim, POLICIES[policy], entered, pilot.queue_limit)
+            chosen = pilot(sim)
+            assert chosen == expected, \
+                f"{policy}, max_queued {max_queued}, step {step}: chose {chosen}, a full sort says {expected}"
+            sim.step(1/60, manual + chosen)
+            for _, event_id in manual:
+                pilot.touch(event_id)
+            sim.resolve_pending(inputs, SKILL)
+
+# ----------------------------
+# Event sampler
+# ----------------------------
+def check_sampler(draws=200_000):
+    """
+    Alias tables encode exactly the weights they were built from and draw
+    them at those rates; sample_many() draws what as many sample() calls
+    would; forced ranges hold; the catalog digest ignores file formatting.
+    """
+    import json
+    from events import AliasTable, EventCatalog, EVENT_RANGES, INT_FIELDS, default_catalog, generate_random_event
+
+    rng = random.Random(5)
+    cases = [[1], [1, 1, 1], [0, 3, 0, 1], [1e-9, 1, 1e9], [rng.random() for _ in range(1000)],
+             [rng.randrange(5) + (i == 0) for i in range(257)]]
+    for weights in cases:
+        n, total = len(weights), sum(weights)
+        table = AliasTable(list(range(n)), weights)
+        implied = [0.0] * n
+        for threshold, value, alias in table.columns:
+            implied[value] += min(threshold, 1.0) / n
+            implied[alias] += (1.0 - min(threshold, 1.0)) / n
+        worst = max(abs(p - w / total) for p, w in zip(implied, weights))
+        assert worst < 1e-9, f"alias table for {n} weights is off by {worst:g}"
+
+    weights = [1, 2, 3, 4]
+    counts = [0] * len(weights)
+    table = AliasTable(list(range(len(weights))), weights)
+    for _ in range(draws):
+        counts[table.sample(rng)] += 1
+    for i, w in enumerate(weights):
+        p = w / sum(weights)
+        sigma = (draws * p * (1 - p)) ** 0.5
+        assert abs(counts[i] - draws * p) < 5 * sigma, f"value {i} drawn {counts[i]} times, expected {draws * p:.0f}"
+
+    catalog = default_catalog()
+    fields = lambda ev: (ev.id, ev.name, ev.category_hint, ev.priority, ev.duration, ev.expire_time,
+                         ev.impact, ev.benefit)
+    one, bulk, legacy = random.Random(1), random.Random(1), random.Random(1)
+    singles = [fields(catalog.sample(i, one)) for i in range(1, 5001)]
+    assert singles == [fields(ev) for ev in catalog.sample_many(5000, 1, bulk)], "sample_many() differs from sample()"
+    assert singles == [fields(generate_random_event(i, legacy)) for i in range(1, 5001)], \
+        "generate_random_event() differs from the default catalog"
+
+    ranges = {"priority": (2, 3), "duration": (1.5, 2.5), "impact": (7, 7)}
+    forced = catalog.with_ranges(ranges)
+    for ev in forced.sample_many(5000, 1, rng):
+        for field, (low, high) in ranges.items():
+            value = getattr(ev, field)
+            if field in INT_FIELDS:
+                assert isinstance(value, int) and low <= value <= high, f"{field}={value!r} outside {low}..{high}"
+            else:
+                assert low <= value < high, f"{field}={value!r} outside [{low}, {high})"
+        for field, (low, high) in EVENT_RANGES.items():
+            assert field in ranges or low <= getattr(ev, field) <= high, f"{field} left its default range"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "catalog.json")
+        with open(path, "w") as f:
+            json.dump({"templates": catalog.templates, "defaults": catalog.defaults}, f, indent=4)
+        assert EventCatalog.load(path).digest == catalog.digest, "catalog digest depends on the file's formatting"
+
+# ----------------------------
+# Runner
+# ----------------------------
+CHECKS = {
+    "snapshots": check_snapshots,
+    "stores": check_stores,
+    "tictactoe": check_tictactoe,
+    "autopilot": check_autopilot,
+    "sampler": check_sampler,
+}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=CHECKS, default=list(CHECKS))
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for name in args.only:
+        start = time.perf_counter()
+        try:
+            note = CHECKS[name]()
+        except AssertionError as exc:
+            failed += 1
+            print(f"{name:>12}: FAILED: {exc}")
+        else:
+            print(f"{name:>12}: {note or 'ok'} ({time.perf_counter() - start:.1f}s)")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,21 @@
+# Colors
+# Kept free of pygame so the headless simulation and log generator can use them.
+
+PRIORITY_COLORS = {
+    0: (100, 100, 100),   # Gray
+    1: (0, 100, 255),     # Blue
+    2: (0, 200, 0),       # Green
+    3: (255, 255, 0),     # Yellow
+    4: (255, 165, 0),     # Orange
+    5: (255, 0, 0)        # Red
+}
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (200, 0, 0)
+GREEN = (0, 200, 0)
+BLUE = (0, 0, 200)
+YELLOW = (255, 255, 0)
+GRAY = (100, 100, 100)
+ORANGE = (255, 165, 0)
+DARK_GRAY = (40, 40, 40)
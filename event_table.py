@@ -0,0 +1,307 @@
+"""
+Array-backed alternative to events.EventStore for headless and stress runs.
+
+Event fields live in parallel NumPy columns. Timers are absolute deadlines,
+as in EventStore, so a tick is one vectorised comparison over the deadline
+column instead of a heap pop per due event, and Simulation.step settles
+the due rows with tick()/totals()/release() without building Event objects.
+NumPy is optional; only this module needs it.
+
+    python stress.py --table            # the stress ramp on an EventTable
+    python benchmarks.py --only ticks   # EventTable vs EventStore ticks
+"""
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from events import Event, INCOMING, ACTIVE, QUEUED, LISTS
+
+# Row states
+FREE = 0
+STATE_CODES = {INCOMING: 1, ACTIVE: 2, QUEUED: 3}
+STATE_NAMES = {code: name for name, code in STATE_CODES.items()}
+TIMERS = {INCOMING: "expire_time", ACTIVE: "duration"}  # list -> column its deadline counts down
+
+NUMERIC_COLUMNS = {
+    "priority": "int8",
+    "duration": "float64",
+    "total_duration": "float64",
+    "expire_time": "float64",
+    "impact": "int32",
+    "benefit": "int32",
+}
+
+
+class EventRow:
+    """Live view of one table row that behaves like an events.Event."""
+
+    __slots__ = ("table", "row")
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    @property
+    def id(self):
+        return int(self.table.ids[self.row])
+
+    @property
+    def name(self):
+        return self.table.names[self.row]
+
+    @property
+    def category_hint(self):
+        return self.table.hints[self.row]
+
+    def modify_priority(self, delta):
+        self.priority = max(0, min(5, self.priority + delta))
+
+    def hint_text(self):
+        return f"{self.category_hint}"
+
+    def to_event(self):
+        ev = Event(self.id, self.name, self.priority, self.total_duration, self.expire_time,
+                   self.impact, self.benefit, self.category_hint)
+        ev.duration = self.duration
+        return ev
+
+def _column_property(column):
+    cast = int if NUMERIC_COLUMNS[column].startswith("int") else float
+    timed = {STATE_CODES[name] for name, timer in TIMERS.items() if timer == column}
+
+    def getter(self):
+        t, r = self.table, self.row
+        if t.state[r] in timed:
+            return float(t.deadline[r] - t.clock)  # time left, as EventStore syncs it
+        return cast(getattr(t, column)[r])
+
+    def setter(self, value):
+        t, r = self.table, self.row
+        getattr(t, column)[r] = value
+        if t.state[r] in timed:
+            t.deadline[r] = t.clock + value
+
+    return property(getter, setter)
+
+for _column in NUMERIC_COLUMNS:
+    setattr(EventRow, _column, _column_property(_column))
+
+
+class EventTable:
+    """
+    Structure-of-arrays event storage with the same interface as
+    events.EventStore. Each list keeps an insertion-ordered id -> row dict
+    for arrival order, freed rows are recycled through a free list and the
+    columns double in size when full. Untimed and free rows have an
+    infinite deadline.
+    """
+
+    def __init__(self, capacity=1024):
+        if np is None:
+            raise ImportError("EventTable requires numpy (pip install numpy)")
+        self.capacity = 0
+        self.ids = np.zeros(0, dtype="int64")
+        self.state = np.zeros(0, dtype="int8")
+        self.seq = np.zeros(0, dtype="int64")  # order timers were started, to break deadline ties
+        self.deadline = np.zeros(0, dtype="float64")
+        for column, dtype in NUMERIC_COLUMNS.items():
+            setattr(self, column, np.zeros(0, dtype=dtype))
+        self.names = []
+        self.hints = []
+        self.free_rows = []
+        self.row_of = {}  # event id -> row
+        self._lists = {name: {} for name in LISTS}  # insertion-ordered id -> row
+        self._location = {}                          # id -> list name
+        self.next_seq = 0
+        self.clock = 0.0
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        extra = capacity - self.capacity
+        for column in ("ids", "state", "seq", *NUMERIC_COLUMNS):
+            old = getattr(self, column)
+            setattr(self, column, np.concatenate([old, np.zeros(extra, dtype=old.dtype)]))
+        self.deadline = np.concatenate([self.deadline, np.full(extra, np.inf)])
+        self.names.extend([None] * extra)
+        self.hints.extend([None] * extra)
+        # Pop from the end, so lowest rows are reused first
+        self.free_rows.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.capacity = capacity
+
+    def __len__(self):
+        return len(self.row_of)
+
+    def __contains__(self, event_id):
+        return event_id in self.row_of
+
+    def count(self, list_name):
+        return len(self._lists[list_name])
+
+    def location(self, event_id):
+        return self._location.get(event_id)
+
+    def get(self, event_id):
+        row = self.row_of.get(event_id)
+        return None if row is None else EventRow(self, row)
+
+    def events(self, list_name, limit=None, start=0):
+        """Yields row views of a list in arrival order."""
+        stop = None if limit is None else start + limit
+        for row in islice(self._lists[list_name].values(), start, stop):
+            yield EventRow(self, row)
+
+    # ---------- Moves ----------
+
+    def add(self, ev, list_name=INCOMING):
+        if not self.free_rows:
+            self._grow(self.capacity * 2)
+        row = self.free_rows.pop()
+        self.ids[row] = ev.id
+        for column in NUMERIC_COLUMNS:
+            getattr(self, column)[row] = getattr(ev, column)
+        self.names[row] = ev.name
+        self.hints[row] = ev.category_hint
+        self.row_of[ev.id] = row
+        self._enter(ev.id, row, list_name)
+        return row
+
+    def add_many(self, evs, list_name=INCOMING):
+        """add() for a batch, one array assignment per column."""
+        n = len(evs)
+        if not n:
+            return
+        while len(self.free_rows) < n:
+            self._grow(self.capacity * 2)
+        rows = self.free_rows[:-n - 1:-1]
+        del self.free_rows[-n:]
+        index = np.array(rows)
+        ids = [ev.id for ev in evs]
+        self.ids[index] = ids
+        for column in NUMERIC_COLUMNS:
+            getattr(self, column)[index] = [getattr(ev, column) for ev in evs]
+        for row, ev in zip(rows, evs):
+            self.names[row] = ev.name
+            self.hints[row] = ev.category_hint
+        self.row_of.update(zip(ids, rows))
+        self._lists[list_name].update(zip(ids, rows))
+        self._location.update(dict.fromkeys(ids, list_name))
+        self.state[index] = STATE_CODES[list_name]
+        timer = TIMERS.get(list_name)
+        if timer:
+            self.deadline[index] = self.clock + getattr(self, timer)[index]
+            self.seq[index] = np.arange(self.next_seq, self.next_seq + n)
+            self.next_seq += n
+
+    def _enter(self, event_id, row, list_name):
+        self._lists[list_name][event_id] = row
+        self._location[event_id] = list_name
+        self.state[row] = STATE_CODES[list_name]
+        timer = TIMERS.get(list_name)
+        if timer:
+            self.deadline[row] = self.clock + getattr(self, timer)[row]
+            self.seq[row] = self.next_seq
+            self.next_seq += 1
+
+    def _leave(self, event_id, row):
+        """Takes a row off its list, writing back the time left on its timer."""
+        list_name = self._location.pop(event_id)
+        del self._lists[list_name][event_id]
+        timer = TIMERS.get(list_name)
+        if timer:
+            getattr(self, timer)[row] = self.deadline[row] - self.clock
+            self.deadline[row] = np.inf
+
+    def move(self, event_id, list_name):
+        row = self.row_of[event_id]
+        self._leave(event_id, row)
+        self._enter(event_id, row, list_name)
+        return EventRow(self, row)
+
+    def remove(self, event_id):
+        """Frees the row and returns a detached events.Event copy."""
+        row = self.row_of.pop(event_id)
+        self._leave(event_id, row)
+        self.state[row] = FREE
+        self.free_rows.append(row)
+        # names/hints stay until the row is reused, so a view taken before
+        # remove() still reads back, as a removed events.Event would
+        return EventRow(self, row).to_event()
+
+    def clear(self):
+        self.__init__(self.capacity)
+
+    # ---------- Timers ----------
+
+    def tick(self, dt):
+        """
+        Vectorised timer update. Returns (expired rows, completed rows) as
+        index arrays in the order EventStore.advance() would return them;
+        the rows stay allocated until release() is called.
+        """
+        self.clock += dt
+        due = np.flatnonzero(self.deadline <= self.clock)
+        if len(due) > 1:
+            due = due[np.lexsort((self.seq[due], self.deadline[due]))]
+        elif not len(due):
+            return due, due
+        incoming = self.state[due] == STATE_CODES[INCOMING]
+        return due[incoming], due[~incoming]
+
+    def totals(self, expired, completed):
+        """HP lost and score gained for the rows returned by tick()."""
+        lost = int(self.impact[expired].sum()) if len(expired) else 0
+        gained = int(self.benefit[completed].sum()) if len(completed) else 0
+        return lost, gained
+
+    def describe(self, rows, column):
+        """(id, name, priority, hint, value of column) per row, for logs and telemetry."""
+        if not len(rows):
+            return ()
+        names, hints = self.names, self.hints
+        listed = rows.tolist()
+        return zip(self.ids[rows].tolist(), [names[r] for r in listed], self.priority[rows].tolist(),
+                   [hints[r] for r in listed], getattr(self, column)[rows].tolist())
+
+    def release(self, *row_arrays):
+        """Frees rows returned by tick()."""
+        for rows in row_arrays:
+            if not len(rows):
+                continue
+            lists, location, row_of = self._lists, self._location, self.row_of
+            for event_id in self.ids[rows].tolist():
+                del lists[location.pop(event_id)][event_id]
+                del row_of[event_id]
+            self.state[rows] = FREE
+            self.deadline[rows] = np.inf
+            self.free_rows.extend(rows.tolist())
+
+    def advance(self, dt):
+        """EventStore-compatible tick: returns detached (expired, completed) events."""
+        expired, completed = self.tick(dt)
+        expired_events = [EventRow(self, int(r)).to_event() for r in expired]
+        completed_events = [EventRow(self, int(r)).to_event() for r in completed]
+        self.release(expired, completed)
+        return expired_events, completed_events
+
+    # ---------- Snapshots ----------
+
+    def dump(self):
+        """EventStore-compatible snapshot rows: (list_name, event, deadline or None)."""
+        rows = []
+        for list_name in LISTS:
+            for row in self._lists[list_name].values():
+                deadline = float(self.deadline[row])
+                rows.append((list_name, EventRow(self, row).to_event(), None if deadline == np.inf else deadline))
+        return rows
+
+    def load(self, clock, rows):
+        """Rebuilds the table from dump() rows, keeping the exact deadlines."""
+        self.__init__(self.capacity)
+        self.clock = clock
+        for list_name, ev, deadline in rows:
+            row = self.add(ev, list_name)
+            if deadline is not None:
+                self.deadline[row] = deadline
@@ -1,4 +1,5 @@
-import random
+import os, json, random, heapq, hashlib
+from itertools import count, islice
 
 class Event:
     def __init__(self, id, name, priority, duration, expire_time, impact, benefit, category_hint):
@@ -19,33 +20,280 @@ class Event:
         """Returns vague hint text for UI/logs."""
         return f"{self.category_hint}"
 
-# Possible event templates
-EVENT_NAMES = [
-    "Analyze Soil", "Radiation Spike", "Camera Malfunction", "Solar Panel Clean",
-    "Antenna Recalibration", "Path Obstruction", "Thermal Regulation Check",
-    "Battery Drain Alert", "Sample Preservation", "Gyroscope Drift"
-]
-
-CATEGORY_HINTS = [
-    "Power", "Navigation", "Communication", "Thermal", "Sensors", "Sample Ops"
-]
-
-def generate_random_event(event_id):
-    name = random.choice(EVENT_NAMES)
-    priority = random.randint(0, 5)
-    duration = random.uniform(5, 15)   # active duration
-    expire_time = random.uniform(8, 20)  # time to expire from incoming
-    impact = random.randint(5, 15)      # HP loss on fail
-    benefit = random.randint(10, 25)    # Score gain on completion
-    category_hint = random.choice(CATEGORY_HINTS)
-
-    return Event(
-        id=event_id,
-        name=name,
-        priority=priority,
-        duration=duration,
-        expire_time=expire_time,
-        impact=impact,
-        benefit=benefit,
-        category_hint=category_hint
-    )
\ No newline at end of file
+# (low, high) ranges for event fields when a catalog doesn't say otherwise
+EVENT_RANGES = {
+    "priority": (0, 5),
+    "duration": (5, 15),      # active duration
+    "expire_time": (8, 20),   # time to expire from incoming
+    "impact": (5, 15),        # HP loss on fail
+    "benefit": (10, 25),      # Score gain on completion
+}
+INT_FIELDS = ("priority", "impact", "benefit")
+
+# ----------------------------
+# Event catalog
+# ----------------------------
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "event_catalog.json")
+
+class AliasTable:
+    """
+    Weighted choice in O(1) per draw (Vose's alias method). One rng.random()
+    picks a column and, with its fractional part, the column's value or its
+    alias.
+    """
+
+    def __init__(self, values, weights):
+        n = len(values)
+        total = float(sum(weights))
+        if not n or total <= 0 or min(weights) < 0:
+            raise ValueError("Weights must be non-negative with a positive total")
+        scaled = [w * n / total for w in weights]
+        threshold = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            lo, hi = small.pop(), large.pop()
+            threshold[lo], alias[lo] = scaled[lo], hi
+            scaled[hi] -= 1.0 - scaled[lo]
+            (small if scaled[hi] < 1.0 else large).append(hi)
+        self.n = n
+        self.columns = [(threshold[i], values[i], values[alias[i]]) for i in range(n)]
+
+    def sample(self, rng=random):
+        x = rng.random() * self.n
+        i = int(x)
+        threshold, value, other = self.columns[i]
+        return value if x - i < threshold else other
+
+def _sampler(field, spec):
+    """
+    Compiles one field's distribution into a sample(rng) callable:
+    [low, high] uniform (whole numbers for integer fields), {value: weight}
+    weighted, or a plain value.
+    """
+    whole = field in INT_FIELDS
+    if isinstance(spec, (list, tuple)):
+        low, high = spec
+        if whole:
+            low, span = int(low), int(high) - int(low) + 1
+            return lambda rng: low + int(rng.random() * span)
+        width = high - low
+        return lambda rng: low + rng.random() * width
+    if isinstance(spec, dict):
+        cast = int if whole else float if field in EVENT_RANGES else str
+        return AliasTable([cast(value) for value in spec], list(spec.values())).sample
+    return lambda rng: spec
+
+class EventCatalog:
+    """
+    Event templates, each with a name, a weight, a category and optional
+    per-field distributions (falling back to the catalog's defaults). A
+    spawn draws the template, then category, priority, duration,
+    expire_time, impact and benefit, one rng.random() each (none for fixed
+    values), so it costs the same for 10 templates or 100,000.
+    """
+
+    def __init__(self, templates, defaults=None, path=None):
+        self.templates = templates
+        self.defaults = dict(EVENT_RANGES, **(defaults or {}))
+        self.path = path  # file it was loaded from, if any
+        self._digest = None
+        samplers = {}  # templates with the same distribution share one sampler
+
+        def sampler(field, spec):
+            key = (field, repr(spec))
+            if key not in samplers:
+                samplers[key] = _sampler(field, spec)
+            return samplers[key]
+
+        compiled = []
+        for template in templates:
+            unknown = set(template) - {"name", "weight", "category", *EVENT_RANGES}
+            if unknown or "name" not in template:
+                raise ValueError(f"Bad event template {template!r}")
+            fields = [sampler(field, template.get(field, self.defaults[field])) for field in EVENT_RANGES]
+            compiled.append((template["name"], sampler("category", template.get("category", "Unknown")), *fields))
+        self._pick = AliasTable(compiled, [template.get("weight", 1) for template in templates])
+
+    @classmethod
+    def load(cls, path=CATALOG_PATH):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["templates"], data.get("defaults"), path)
+
+    @property
+    def digest(self):
+        """SHA-256 of the templates and defaults, whatever the file's formatting; names a catalog in recordings."""
+        if self._digest is None:
+            content = json.dumps({"templates": self.templates, "defaults": self.defaults},
+                                 sort_keys=True, separators=(",", ":"))
+            self._digest = hashlib.sha256(content.encode()).hexdigest()
+        return self._digest
+
+    def with_ranges(self, ranges):
+        """A copy with {field: (low, high)} forced on every template, e.g. for balance sweeps."""
+        forced = {field: list(bounds) for field, bounds in ranges.items()}
+        return EventCatalog([dict(template, **forced) for template in self.templates], self.defaults)
+
+    def sample(self, event_id, rng=random):
+        name, category, priority, duration, expire_time, impact, benefit = self._pick.sample(rng)
+        hint = category(rng)
+        return Event(event_id, name, priority(rng), duration(rng), expire_time(rng), impact(rng), benefit(rng), hint)
+
+    def sample_many(self, n, first_id, rng=random):
+        """n events with consecutive ids; the same draws, in the same order, as n sample() calls."""
+        pick = self._pick.sample
+        events = []
+        for event_id in range(first_id, first_id + n):
+            name, category, priority, duration, expire_time, impact, benefit = pick(rng)
+            hint = category(rng)
+            events.append(Event(event_id, name, priority(rng), duration(rng), expire_time(rng),
+                                impact(rng), benefit(rng), hint))
+        return events
+
+_default_catalog = None
+
+def default_catalog():
+    """The shipped catalog (event_catalog.json), loaded at first use."""
+    global _default_catalog
+    if _default_catalog is None:
+        _default_catalog = EventCatalog.load()
+    return _default_catalog
+
+def generate_random_event(event_id, rng=random):
+    """One event from the shipped catalog. Forced ranges go through SimConfig.event_ranges, built once."""
+    return default_catalog().sample(event_id, rng)
+
+
+# ----------------------------
+# Event store
+# ----------------------------
+INCOMING = "incoming"
+ACTIVE = "active"
+QUEUED = "queue"
+LISTS = (INCOMING, ACTIVE, QUEUED)
+
+class EventStore:
+    """
+    Holds the incoming/active/queued events with id lookup and O(1) moves.
+
+    Timers are stored as absolute deadlines on a heap per timed list
+    (incoming: expire_time, active: duration), so advance() only touches
+    events that are actually due. An event's expire_time/duration fields
+    are brought up to date whenever it is read back through the store.
+    """
+
+    def __init__(self):
+        self.clock = 0.0
+        self._lists = {name: {} for name in LISTS}  # insertion-ordered id -> event
+        self._location = {}                          # id -> list name
+        self._deadline = {}                          # id -> absolute deadline while timed
+        self._heaps = {INCOMING: [], ACTIVE: []}     # (deadline, seq, id)
+        self._seq = count()
+
+    def __len__(self):
+        return len(self._location)
+
+    def __contains__(self, event_id):
+        return event_id in self._location
+
+    def count(self, list_name):
+        return len(self._lists[list_name])
+
+    def location(self, event_id):
+        return self._location.get(event_id)
+
+    def get(self, event_id):
+        list_name = self._location.get(event_id)
+        if list_name is None:
+            return None
+        ev = self._lists[list_name][event_id]
+        self._sync(ev)
+        return ev
+
+    def events(self, list_name, limit=None, start=0):
+        """Yields events of a list in arrival order, with timers synced."""
+        stop = None if limit is None else start + limit
+        for ev in islice(self._lists[list_name].values(), start, stop):
+            self._sync(ev)
+            yield ev
+
+    # ---------- Moves ----------
+
+    def add(self, ev, list_name=INCOMING):
+        self._lists[list_name][ev.id] = ev
+        self._location[ev.id] = list_name
+        self._start_timer(ev, list_name)
+
+    def add_many(self, evs, list_name=INCOMING):
+        for ev in evs:
+            self.add(ev, list_name)
+
+    def move(self, event_id, list_name):
+        ev = self.remove(event_id)
+        self.add(ev, list_name)
+        return ev
+
+    def remove(self, event_id):
+        list_name = self._location[event_id]
+        ev = self._lists[list_name].pop(event_id)
+        self._sync(ev)
+        del self._location[event_id]
+        self._deadline.pop(event_id, None)  # heap entry becomes stale
+        return ev
+
+    def clear(self):
+        self.__init__()
+
+    # ---------- Timers ----------
+
+    def _timer_attr(self, list_name):
+        return "expire_time" if list_name == INCOMING else "duration"
+
+    def _start_timer(self, ev, list_name):
+        if list_name not in self._heaps:
+            return
+        deadline = self.clock + getattr(ev, self._timer_attr(list_name))
+        self._deadline[ev.id] = deadline
+        heapq.heappush(self._heaps[list_name], (deadline, next(self._seq), ev.id))
+
+    def _sync(self, ev):
+        deadline = self._deadline.get(ev.id)
+        if deadline is not None:
+            setattr(ev, self._timer_attr(self._location[ev.id]), deadline - self.clock)
+
+    def _pop_due(self, list_name):
+        heap = self._heaps[list_name]
+        due = []
+        while heap and heap[0][0] <= self.clock:
+            deadline, _, event_id = heapq.heappop(heap)
+            # Skip entries left behind by moves/removals
+            if self._location.get(event_id) != list_name or self._deadline.get(event_id) != deadline:
+                continue
+            due.append(self.remove(event_id))
+        return due
+
+    def advance(self, dt):
+        """Moves the clock forward. Returns (expired incoming, completed active)."""
+        self.clock += dt
+        return self._pop_due(INCOMING), self._pop_due(ACTIVE)
+
+    # ---------- Snapshots ----------
+
+    def dump(self):
+        """[(list_name, event, deadline or None)] in arrival order, timers synced."""
+        return [(list_name, ev, self._deadline.get(ev.id))
+                for list_name in LISTS for ev in self.events(list_name)]
+
+    def load(self, clock, rows):
+        """Rebuilds the store from dump() rows, keeping the exact deadlines."""
+        self.__init__()
+        self.clock = clock
+        for list_name, ev, deadline in rows:
+            self._lists[list_name][ev.id] = ev
+            self._location[ev.id] = list_name
+            if deadline is not None:
+                self._deadline[ev.id] = deadline
+                heapq.heappush(self._heaps[list_name], (deadline, next(self._seq), ev.id))
+
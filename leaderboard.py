@@ -0,0 +1,162 @@
+import os, time, socket, sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "rover_game", "leaderboard.db")
+
+MODE_INFINITE = "infinite"
+
+def mode_for(mission_time):
+    """Leaderboard mode of a mission length: "5min", or "infinite"."""
+    return MODE_INFINITE if not mission_time else f"{int(mission_time) // 60}min"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    mode TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    health INTEGER,
+    elapsed REAL,
+    seed INTEGER,
+    station TEXT,
+    played_at REAL
+);
+CREATE INDEX IF NOT EXISTS scores_mode_score ON scores (mode, score DESC);
+CREATE INDEX IF NOT EXISTS scores_score ON scores (score DESC);
+
+-- Runs per (mode, score). Scores are small integers, so this stays a few
+-- thousand rows however many runs are stored, and percentile/rank lookups
+-- sum it instead of counting through the scores index.
+CREATE TABLE IF NOT EXISTS score_counts (
+    mode TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (mode, score)
+) WITHOUT ROWID;
+"""
+
+# ----------------------------
+# Score store
+# ----------------------------
+class Leaderboard:
+    """
+    SQLite-backed score store. add() buffers runs and writes them batch_size
+    at a time in one transaction; queries flush first. A connection belongs
+    to one thread; LeaderboardService runs one off the game loop.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, batch_size=500, station=None):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")  # readers don't wait on the writer
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self.batch_size = batch_size
+        self.station = station or socket.gethostname()
+        self.pending = []
+
+    def add(self, mode, score, health=None, elapsed=None, seed=None, played_at=None):
+        self.pending.append((mode, int(score), health, elapsed, seed, self.station, played_at or time.time()))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def add_many(self, runs):
+        """Bulk import of (mode, score, health, elapsed, seed, station, played_at) tuples."""
+        self.pending.extend(runs)
+        self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        runs, self.pending = self.pending, []
+        counts = {}
+        for run in runs:
+            counts[run[0], run[1]] = counts.get((run[0], run[1]), 0) + 1
+        with self.db:
+            self.db.executemany("INSERT INTO scores (mode, score, health, elapsed, seed, station, played_at) "
+                                "VALUES (?, ?, ?, ?, ?, ?, ?)", runs)
+            self.db.executemany("INSERT INTO score_counts (mode, score, n) VALUES (?, ?, ?) "
+                                "ON CONFLICT (mode, score) DO UPDATE SET n = n + excluded.n",
+                                [(mode, score, n) for (mode, score), n in counts.items()])
+
+    # ---------- Queries ----------
+
+    def top(self, mode=None, k=10):
+        """Best k runs as (score, health, elapsed, station, played_at), via the score indexes."""
+        self.flush()
+        columns = "SELECT score, health, elapsed, station, played_at FROM scores"
+        if mode is None:
+            return self.db.execute(f"{columns} ORDER BY score DESC LIMIT ?", (k,)).fetchall()
+        return self.db.execute(f"{columns} WHERE mode = ? ORDER BY score DESC LIMIT ?", (mode, k)).fetchall()
+
+    def _sum(self, mode, condition="", args=()):
+        where = " AND ".join(filter(None, ["mode = ?" if mode else "", condition]))
+        sql = "SELECT COALESCE(SUM(n), 0) FROM score_counts" + (f" WHERE {where}" if where else "")
+        return self.db.execute(sql, ((mode,) if mode else ()) + args).fetchone()[0]
+
+    def count(self, mode=None):
+        self.flush()
+        return self._sum(mode)
+
+    def rank(self, score, mode=None):
+        """1-based position a score would take (ties share the best position)."""
+        self.flush()
+        return self._sum(mode, "score > ?", (score,)) + 1
+
+    def percentile(self, score, mode=None):
+        """Percentile rank of score among stored runs: below + half of the ties, in percent."""
+        self.flush()
+        total = self._sum(mode)
+        if not total:
+            return 100.0
+        below = self._sum(mode, "score < ?", (score,))
+        ties = self._sum(mode, "score = ?", (score,))
+        return 100.0 * (below + 0.5 * ties) / total
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+# ----------------------------
+# Off-thread access
+# ----------------------------
+class LeaderboardService:
+    """
+    Owns a Leaderboard on a single worker thread. Calls return futures, so
+    the game-over screen can draw immediately and show results once
+    future.done(), however slow the disk is.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, **options):
+        self.path = path
+        self.options = options
+        self.board = None  # created on the worker thread, which then owns it
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="leaderboard")
+
+    def _board(self):
+        if self.board is None:
+            self.board = Leaderboard(self.path, **self.options)
+        return self.board
+
+    def submit(self, method, *args, **kwargs):
+        """Runs Leaderboard.method(*args, **kwargs) on the worker thread."""
+        return self._executor.submit(lambda: getattr(self._board(), method)(*args, **kwargs))
+
+    def finish_run(self, mode, score, k=5, **fields):
+        """Stores a run and returns a future of its standing: top k, rank, total and percentile."""
+        def run():
+            board = self._board()
+            board.add(mode, score, **fields)
+            return {
+                "mode": mode,
+                "top": board.top(mode, k),
+                "rank": board.rank(score, mode),
+                "count": board.count(mode),
+                "percentile": board.percentile(score, mode),
+            }
+        return self._executor.submit(run)
+
+    def close(self):
+        if self.board is not None:
+            self._executor.submit(self.board.close)
+        self._executor.shutdown(wait=True)
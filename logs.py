@@ -1,5 +1,6 @@
 import random
-from utils import WHITE, ORANGE, RED
+from collections import deque, namedtuple
+from colors import WHITE, ORANGE, RED
 
 # Categories to hint at event relevance
 CATEGORIES = ["Power", "Navigation", "Communication", "Thermal", "Sensors", "Sample Ops"]
@@ -11,8 +12,8 @@ LOG_TYPES = [
     ("ERR", RED),
 ]
 
-def random_hex():
-    return "".join(random.choice("0123456789ABCDEF") for _ in range(8))
+def random_hex(rng=random):
+    return f"{rng.getrandbits(32):08X}"
 
 def generate_log():
     """Generates pseudo-random system log messages with categories or random dumps."""
@@ -27,4 +28,108 @@ def generate_log():
         # Random memory dump style log
         message = f"MEMDUMP[{random.randint(1000,9999)}]: 0x{random_hex()} 0x{random_hex()} 0x{random_hex()}"
 
-    return (message, color)
\ No newline at end of file
+    return (message, color)
+
+# ----------------------------
+# Batched generation
+# ----------------------------
+_MASK32 = 0xFFFFFFFF
+
+def generate_logs(n, rng=random):
+    """
+    Bulk version of generate_log(): n (message, color) records from the
+    same distribution, using one getrandbits(128) call per record for the
+    coin flip, codes and hex words instead of ~10 separate draws.
+    """
+    types = rng.choices(LOG_TYPES, k=n)
+    categories = rng.choices(CATEGORIES, k=n)
+    records = []
+    append = records.append
+    for (log_type, color), category in zip(types, categories):
+        bits = rng.getrandbits(128)
+        high = bits >> 97  # 31 bits, enough to make the modulo bias negligible
+        if bits >> 96 & 1:
+            message = f"{log_type}: {category} anomaly at 0x{bits & _MASK32:08X} :: code {100 + high % 900}"
+        else:
+            message = (f"MEMDUMP[{1000 + high % 9000}]: 0x{bits & _MASK32:08X} "
+                       f"0x{bits >> 32 & _MASK32:08X} 0x{bits >> 64 & _MASK32:08X}")
+        append((message, color))
+    return records
+
+class LogGenerator:
+    """
+    Streams log records at `rate` per second of simulated time. Records are
+    generated batch_size at a time from a seedable rng.
+    """
+
+    def __init__(self, rate=2.0, rng=random, batch_size=256):
+        self.rate = rate
+        self.rng = rng
+        self.batch_size = batch_size
+        self.buffer = []
+        self.pos = 0
+        self.owed = 0.0  # fractional records carried between calls
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.pos >= len(self.buffer):
+            self.buffer = generate_logs(self.batch_size, self.rng)
+            self.pos = 0
+        record = self.buffer[self.pos]
+        self.pos += 1
+        return record
+
+    def take(self, n):
+        """The next n records as a list."""
+        out = []
+        while n > 0:
+            if self.pos >= len(self.buffer):
+                self.buffer = generate_logs(max(self.batch_size, n), self.rng)
+                self.pos = 0
+            chunk = self.buffer[self.pos:self.pos + n]
+            self.pos += len(chunk)
+            n -= len(chunk)
+            out.extend(chunk)
+        return out
+
+    def due(self, dt):
+        """Records owed for dt seconds at the configured rate."""
+        self.owed += dt * self.rate
+        n = int(self.owed)
+        if n <= 0:
+            return []
+        self.owed -= n
+        return self.take(n)
+
+# ----------------------------
+# Log buffer
+# ----------------------------
+LogEntry = namedtuple("LogEntry", "seq message color")
+
+class LogBuffer:
+    """Fixed-capacity ring buffer of LogEntry with O(1) append."""
+
+    def __init__(self, capacity=30):
+        self.entries = deque(maxlen=capacity)
+        self.next_seq = 0  # total lines ever appended
+
+    def append(self, message, color=WHITE):
+        self.entries.append(LogEntry(self.next_seq, message, color))
+        self.next_seq += 1
+
+    def tail(self, n):
+        """The newest n entries, oldest first."""
+        n = min(n, len(self.entries))
+        return [self.entries[i] for i in range(-n, 0)]
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
@@ -1,62 +1,122 @@
-import pygame, sys, random, time
-from utils import WHITE, BLACK, RED, GREEN, ORANGE, PRIORITY_COLORS, get_font, get_contrast_color, Button
-from events import generate_random_event
-from minigames import get_random_minigame
-from logs import generate_log
+import time
+LAUNCH_TIME = time.perf_counter()  # before the imports, so startup timing covers them
+
+import pygame, sys, os, argparse
+from utils import WIDTH, HEIGHT, WHITE, BLACK, RED, GREEN, ORANGE, PRIORITY_COLORS, get_font, preload_fonts, render_text, get_contrast_color, Button, Region, refresh_regions, InputRouter
+from simulation import Simulation, FixedTimestep, TICK_RATE, MAX_CATCH_UP
+from events import EventCatalog, default_catalog
+from replay import Recorder, Recording
+from profiler import FrameProfiler
+import snapshot
+from telemetry import TelemetryWriter
+from leaderboard import LeaderboardService, DEFAULT_PATH as LEADERBOARD_PATH, mode_for
+from tictactoe import DIFFICULTIES
+from autopilot import Autopilot, POLICIES as AUTOPILOT_POLICIES
 
 # ----------------------------
 # Init & Constants
 # ----------------------------
-pygame.init()
-info = pygame.display.Info()
-WIDTH, HEIGHT = info.current_w, info.current_h
-WIN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Rover Event Control")
-
-MAX_ACTIVE_EVENTS = 5
+WIN = None  # logical WIDTH x HEIGHT surface everything draws to
+font = None
+FONT_SIZE = 22
+
+RENDER_FPS = 60  # target draw rate, independent of the simulation TICK_RATE
+STARTUP_BUDGET = 0.5  # seconds from launch to the first menu frame
+
+# SDL scales the logical surface to the window (letterboxed) on the GPU and
+# maps mouse positions back, so layout and draw cost ignore the display size
+DISPLAY_FLAGS = pygame.SCALED | pygame.RESIZABLE
+
+# Event types the game reads; everything else is dropped by SDL before the queue
+ALLOWED_EVENTS = [pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION,
+                  pygame.MOUSEWHEEL, pygame.VIDEOEXPOSE]
+
+def init_display():
+    global WIN, font
+    # Only the subsystems the game uses; pygame.init() would also open audio
+    pygame.display.init()
+    pygame.font.init()
+    try:
+        WIN = pygame.display.set_mode((WIDTH, HEIGHT), DISPLAY_FLAGS)
+    except pygame.error:
+        WIN = pygame.display.set_mode((WIDTH, HEIGHT))  # no renderer to scale with
+    pygame.display.set_caption("Rover Event Control")
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(ALLOWED_EVENTS)
+    preload_fonts()
+    font = get_font(FONT_SIZE)
+    center_buttons()
+    build_regions()
+    build_screens()
 
 # Game States
 STATE_MENU = 0
 STATE_PLAYING = 1
 STATE_GAME_OVER = 2
 current_state = STATE_MENU
+STATE_NAMES = {STATE_MENU: "menu", STATE_PLAYING: "playing", STATE_GAME_OVER: "game_over"}
 
 # Game variables
-MISSION_TIME = 300  # default 5 min
-event_id_counter = 1
-incoming_events = []
-active_events = []
-queued_events = []
+sim = Simulation()
 selected_event = None
 selected_list = None
-health = 100
-score = 0
-start_time = time.time()
-
-# Logs
-logs = []
-last_log_time = 0
-next_heal_trigger = random.randint(20, 40)
-
-font = get_font(22)
+pending_actions = []  # (name, event_id) fed to sim.step() next frame
+
+# Deterministic sessions
+tick_rate = TICK_RATE
+session_seed = None   # fixed seed for every session, or None for a fresh one
+record_path = None    # where to save the input recording of each session
+recorder = None
+replaying = None      # Recording whose mini-game results replace live play
+catalog_path = None   # --catalog file, or None for the shipped event_catalog.json
+
+# Profiling
+profiler = FrameProfiler()
+profile_path = None   # export target for --profile / F4
+show_overlay = False
+
+# Event dispatch assist (--autopilot, A toggles it)
+autopilot_policy = "edf"
+autopilot = None      # Autopilot while enabled
+
+# Gameplay analytics (--telemetry), written off the main thread
+telemetry_path = None
+telemetry = None
+
+# Remote displays (--spectate), served off the main thread
+spectator_address = None  # "[HOST:]PORT", or None for no server
+spectator = None
+
+# Persistent leaderboard, queried off the main thread
+leaderboard_path = LEADERBOARD_PATH  # None disables it
+leaderboard = None     # LeaderboardService, opened at the first game over
+standing = None        # future of the last run's leaderboard standing
+standing_drawn = False
+
+# Checkpoints of infinite-mode sessions, for crash recovery
+SNAPSHOT_INTERVAL = 5.0  # seconds of mission time between checkpoints
+snapshot_path = snapshot.DEFAULT_PATH
+snapshot_writer = None
+last_snapshot_tick = 0
 
 # ----------------------------
 # Reset Game
 # ----------------------------
-def reset_game():
-    global event_id_counter, incoming_events, active_events, queued_events
-    global selected_event, selected_list, health, score, start_time, logs, next_heal_trigger
-    event_id_counter = 1
-    incoming_events.clear()
-    active_events.clear()
-    queued_events.clear()
+def reset_game(mission_time, seed=None):
+    global selected_event, selected_list, recorder, minigame_scene
+    minigame_scene = None
+    sim.reset(mission_time, seed if seed is not None else session_seed)
+    recorder = None
+    if record_path:
+        catalog = {"path": catalog_path, "digest": sim.catalog.digest}
+        recorder = Recorder(sim.seed, mission_time, tick_rate, catalog)
     selected_event = None
     selected_list = None
-    health = 100
-    score = 0
-    logs.clear()
-    start_time = time.time()
-    next_heal_trigger = random.randint(20, 40)
+    pending_actions.clear()
+    log_surfaces.clear()
+    for list_name in panel_scroll:
+        panel_scroll[list_name] = 0
+        row_surfaces[list_name].clear()
 
 # ----------------------------
 # Buttons for gameplay
@@ -82,343 +142,801 @@ def center_buttons():
         rect = (start_x + i * (btn_width + spacing), y, btn_width, btn_height)
         buttons.append(Button(rect, label, action))
 
-center_buttons()
-
 # ----------------------------
 # Event Actions
 # ----------------------------
-def honor_event():
-    global selected_event, selected_list, health, score
-    if selected_event and selected_list == "incoming" and len(active_events) < MAX_ACTIVE_EVENTS:
-        if selected_event in incoming_events:
-            incoming_events.remove(selected_event)
-            active_events.append(selected_event)
-            logs.append(f"Honored: {selected_event.hint_text()} (P{selected_event.priority})")
+def push_action(name, allowed_lists, clear_selection=True):
+    global selected_event
+    if selected_event and selected_list in allowed_lists:
+        pending_actions.append((name, selected_event.id))
+        if clear_selection:
             selected_event = None
-            # Mini-game
-            if random.random() < 0.3:
-                if not trigger_minigame():
-                    health -= 10
-                else:
-                    score += 10
+
+def honor_event():
+    push_action("honor", ("incoming",))
 
 def reject_event():
-    global selected_event, selected_list, health
-    if selected_event and selected_list == "incoming":
-        if selected_event in incoming_events:
-            incoming_events.remove(selected_event)
-            health -= 5
-            logs.append(f"Rejected: {selected_event.hint_text()} (P{selected_event.priority})")
-        selected_event = None
+    push_action("reject", ("incoming",))
 
 def queue_event():
-    global selected_event, selected_list
-    if selected_event and selected_list == "incoming":
-        if selected_event in incoming_events:
-            incoming_events.remove(selected_event)
-            queued_events.append(selected_event)
-            logs.append(f"Queued: {selected_event.hint_text()} (P{selected_event.priority})")
-            selected_event = None
+    push_action("queue", ("incoming",))
 
 def execute_from_queue():
-    global selected_event, selected_list
-    if selected_event and selected_list == "queue" and len(active_events) < MAX_ACTIVE_EVENTS:
-        if selected_event in queued_events:
-            queued_events.remove(selected_event)
-            active_events.append(selected_event)
-            logs.append(f"Executed: {selected_event.hint_text()} (P{selected_event.priority})")
-            selected_event = None
+    push_action("execute", ("queue",))
 
 def terminate_event():
-    global selected_event, selected_list, health
-    if selected_event:
-        if selected_list == "active" and selected_event in active_events:
-            fraction_completed = 1 - (selected_event.duration / selected_event.total_duration)
-            damage = 10 * (1 - fraction_completed) + 3 * fraction_completed
-            health -= int(damage)
-            active_events.remove(selected_event)
-            logs.append(f"Terminated: {selected_event.hint_text()} (-{int(damage)} HP)")
-        elif selected_list == "queue" and selected_event in queued_events:
-            queued_events.remove(selected_event)
-            logs.append(f"Removed from Queue: {selected_event.hint_text()}")
-        selected_event = None
+    push_action("terminate", ("active", "queue"))
 
 def modify_priority():
-    global selected_event, selected_list
-    if selected_event and selected_list == "queue":
-        selected_event.modify_priority(1)
+    push_action("priority_up", ("queue",), clear_selection=False)
 
 def modify_priority_down():
-    global selected_event, selected_list
-    if selected_event and selected_list == "queue":
-        selected_event.modify_priority(-1)
+    push_action("priority_down", ("queue",), clear_selection=False)
+
+def toggle_autopilot():
+    global autopilot
+    autopilot = None if autopilot else Autopilot(autopilot_policy)
+
+# ----------------------------
+# Mini-games
+# ----------------------------
+PAUSE_SIM_DURING_MINIGAMES = True  # False keeps events ageing while a mini-game runs
+minigame_scene = None
+minigame_reason = None
 
 def trigger_minigame():
-    mg = get_random_minigame()
-    return mg(WIN)
+    """Starts a mini-game scene for the oldest pending simulation request."""
+    global minigame_scene, minigame_reason
+    from minigames import get_random_minigame  # not needed until the first mini-game
+    minigame_reason = sim.state.pending_minigames[0]
+    minigame_scene = get_random_minigame()()
+
+def finish_minigame():
+    global minigame_scene
+    success = minigame_scene.result
+    if recorder:
+        recorder.minigame(sim.state.tick, minigame_reason, success)
+    if telemetry:
+        telemetry.emit("minigame_scene", tick=sim.state.tick, game=type(minigame_scene).__name__,
+                       reason=minigame_reason, success=bool(success), seconds=round(minigame_scene.time, 3))
+    sim.resolve_minigame(minigame_reason, success)
+    minigame_scene = None
+    invalidate_ui()
+
+def update_minigame(events, dt):
+    """Runs one frame of the active mini-game scene: input, update, draw."""
+    start = time.perf_counter()
+    scene = minigame_scene
+    for event in events:
+        scene.handle_event(event)
+    scene.update(dt)
+    if scene.done:
+        finish_minigame()
+    else:
+        scene.draw(WIN)
+        pygame.display.update()
+    if profiler.enabled:
+        profiler.record(f"minigame.{type(scene).__name__}", time.perf_counter() - start)
+        profiler.lap("minigame", start)
 
 # ----------------------------
 # UI Drawing
 # ----------------------------
 incoming_rects, active_rects, queue_rects = [], [], []
 
+row_surfaces = {"incoming": {}, "active": {}, "queue": {}}  # per panel: row_key -> surface, visible rows only
+
 def draw_event_list(events, title, x, y, list_name, rect_store, show_timer=False):
-    WIN.blit(font.render(title, True, ORANGE), (x, y))
+    """
+    Draws the visible window of one panel. Row surfaces are cached by
+    content, so scrolling or a repaint reuses every row that did not change.
+    """
+    count = sim.state.events.count(list_name)
+    if count > PANEL_ROWS:
+        first = panel_scroll[list_name]
+        title = f"{title} ({first + 1}-{first + len(events)} of {count})"
+    WIN.blit(render_text(title, FONT_SIZE, ORANGE), (x, y))
     rect_store.clear()
 
-    box_width = 400
-    max_width = box_width - 10
-    vertical_spacing = 46   # more padding
-    box_height = 32
-
-    for i, ev in enumerate(events[:8]):
-        rect_y = y + 30 + i * vertical_spacing
-        rect = pygame.Rect(x, rect_y, box_width, box_height)
+    cache = row_surfaces[list_name]
+    visible = set()
+    for i, ev in enumerate(events[:PANEL_ROWS]):
+        rect = pygame.Rect(x, y + 30 + i * ROW_SPACING, PANEL_WIDTH, ROW_HEIGHT)
         rect_store.append((rect, ev))
-
-        # Priority color
-        priority_color = PRIORITY_COLORS.get(ev.priority, (70,70,70))
-        if ev == selected_event:
-            priority_color = tuple(min(255, c + 50) for c in priority_color)
-        pygame.draw.rect(WIN, priority_color, rect)
-
-        # Build event text
-        text = f"{ev.name} [{ev.hint_text()}] P{ev.priority}"
-        if show_timer:
-            text += f" [{ev.duration:.1f}s]"
+        key = row_key(ev, show_timer)
+        surf = cache.get(key)
+        if surf is None:
+            surf = cache[key] = render_row(ev, key[2], key[3])
+        WIN.blit(surf, rect)
+        visible.add(key)
+    for key in cache.keys() - visible:
+        del cache[key]
+
+def row_key(ev, show_timer):
+    timer = ev.duration if show_timer else ev.expire_time
+    return (ev.id, ev.priority, f"{timer:.1f}", ev is selected_event)
+
+def render_row(ev, timer_text, selected):
+    """One event row; ROW_SPACING tall, as a wrapped second line may hang below the box."""
+    surf = pygame.Surface((PANEL_WIDTH, ROW_SPACING))
+    surf.fill(BACKGROUND)
+    max_width = PANEL_WIDTH - 10
+
+    # Priority color
+    priority_color = PRIORITY_COLORS.get(ev.priority, (70,70,70))
+    if selected:
+        priority_color = tuple(min(255, c + 50) for c in priority_color)
+    pygame.draw.rect(surf, priority_color, (0, 0, PANEL_WIDTH, ROW_HEIGHT))
+
+    text = f"{ev.name} [{ev.hint_text()}] P{ev.priority} [{timer_text}s]"
+    text_color = get_contrast_color(priority_color)
+
+    # Simple wrapping
+    words = text.split(" ")
+    lines = [""]
+    for word in words:
+        test_line = lines[-1] + word + " "
+        if font.size(test_line)[0] <= max_width:
+            lines[-1] = test_line
         else:
-            text += f" [{ev.expire_time:.1f}s]"
-
-        text_color = get_contrast_color(priority_color)
-
-        # Simple wrapping
-        words = text.split(" ")
-        lines = [""]
-        for word in words:
-            test_line = lines[-1] + word + " "
-            if font.size(test_line)[0] <= max_width:
-                lines[-1] = test_line
-            else:
-                lines.append(word + " ")
-
-        for j, line in enumerate(lines[:2]):
-            WIN.blit(font.render(line.strip(), True, text_color),
-                     (x+5, rect_y + j*14))
+            lines.append(word + " ")
+
+    # Row text changes with every timer tick, so it bypasses the shared LRU
+    for j, line in enumerate(lines[:2]):
+        surf.blit(font.render(line.strip(), True, text_color), (5, j*14))
+    return surf
+
+# Event panel layout
+PANEL_TOP = 120
+PANEL_WIDTH = 400
+PANEL_SPACING = 20
+ROW_SPACING = 46
+ROW_HEIGHT = 32
+LOGS_TOP = 400
+PANEL_ROWS = (LOGS_TOP - PANEL_TOP - 30) // ROW_SPACING  # rows that fit above the logs
+BACKGROUND = (30, 30, 30)
+
+panel_scroll = {"incoming": 0, "active": 0, "queue": 0}  # first visible row of each panel
+
+ui_regions = {}
+full_redraw = True
+
+def panel_x(index):
+    total_width = 3 * PANEL_WIDTH + 2 * PANEL_SPACING
+    return (WIDTH - total_width) // 2 + index * (PANEL_WIDTH + PANEL_SPACING)
+
+def draw_health(surface, rect):
+    pygame.draw.rect(surface, RED, rect)
+    pygame.draw.rect(surface, GREEN, (rect.x, rect.y, 4*max(0, sim.state.health), rect.height))
+
+def draw_status(surface, rect):
+    surface.blit(render_text(f"Score: {sim.state.score}", FONT_SIZE, WHITE), (rect.x, rect.y + 5))
+    remaining = sim.remaining_time()
+    if remaining is not None:
+        surface.blit(render_text(f"Time: {remaining}s", FONT_SIZE, WHITE), (rect.x, rect.y + 30))
+    if autopilot:
+        # Beside the time, which stays short, so a long score can't run into it
+        surface.blit(render_text(f"Autopilot: {autopilot.policy.upper()}", FONT_SIZE, GREEN), (rect.x + 140, rect.y + 30))
+
+LOG_LINES = 7
+log_surfaces = {}  # LogEntry.seq -> rendered line, only for visible lines
+
+def draw_logs(surface, rect):
+    surface.blit(render_text("System Logs", FONT_SIZE, ORANGE), (WIDTH//2 - 100, rect.y))
+    log_area = pygame.Rect(rect.x, rect.y + 30, rect.width, 200)
+    pygame.draw.rect(surface, (40, 40, 40), log_area)
+    pygame.draw.rect(surface, WHITE, log_area, 1)
+    visible = sim.state.logs.tail(LOG_LINES)
+    for i, entry in enumerate(visible):
+        surf = log_surfaces.get(entry.seq)
+        if surf is None:
+            # Log lines are one-off text, so they bypass the shared LRU
+            surf = log_surfaces[entry.seq] = font.render(entry.message, True, entry.color)
+        surface.blit(surf, (log_area.x + 10, log_area.y + 5 + i*22))
+    for seq in log_surfaces.keys() - {entry.seq for entry in visible}:
+        del log_surfaces[seq]
+
+def draw_buttons(surface, rect):
+    for btn in buttons:
+        btn.draw(surface, FONT_SIZE)
+
+def build_regions():
+    """Lays out the retained gameplay regions (needs the buttons placed first)."""
+    panel_height = 30 + PANEL_ROWS * ROW_SPACING
+    panels = [
+        ("incoming", "Incoming Events", incoming_rects, False),
+        ("active", "Active Events", active_rects, True),
+        ("queue", "Queued Events", queue_rects, False),
+    ]
+    ui_regions.clear()
+    ui_regions["health"] = Region((WIDTH//2 - 200, 20, 400, 25), draw_health, BACKGROUND)
+    ui_regions["status"] = Region((WIDTH//2 - 50, 50, 400, 60), draw_status, BACKGROUND)  # fits "Autopilot: WEIGHTED"
+    for i, (list_name, title, rect_store, show_timer) in enumerate(panels):
+        def draw_panel(surface, rect, list_name=list_name, title=title, rect_store=rect_store, show_timer=show_timer):
+            draw_event_list(panel_events(list_name), title, rect.x, rect.y, list_name, rect_store, show_timer)
+        ui_regions[list_name] = Region((panel_x(i), PANEL_TOP, PANEL_WIDTH, panel_height), draw_panel, BACKGROUND)
+    ui_regions["logs"] = Region((WIDTH//2 - 480, LOGS_TOP, 960, 231), draw_logs, BACKGROUND)
+    ui_regions["buttons"] = Region(buttons[0].rect.unionall([b.rect for b in buttons]), draw_buttons, BACKGROUND)
+
+def panel_events(list_name):
+    """The visible window of a list. The scroll offset is clamped as the list shrinks."""
+    events = sim.state.events
+    first = max(0, min(panel_scroll[list_name], events.count(list_name) - PANEL_ROWS))
+    panel_scroll[list_name] = first
+    return list(events.events(list_name, PANEL_ROWS, first))
+
+def scroll_panel(list_name, steps):
+    """Scrolls a panel by wheel steps (positive is up)."""
+    panel_scroll[list_name] = max(0, panel_scroll[list_name] - steps)
+
+def panel_key(list_name):
+    """Everything a panel shows, so it is only repainted when this changes."""
+    count = sim.state.events.count(list_name)
+    rows = tuple(row_key(ev, list_name == "active") for ev in panel_events(list_name))
+    return (panel_scroll[list_name], count if count > PANEL_ROWS else None, rows)
+
+def invalidate_ui():
+    """Forces a full repaint, e.g. after a menu or mini-game drew over the screen."""
+    global full_redraw
+    full_redraw = True
 
 def draw_ui():
-    WIN.fill((30, 30, 30))
-
-    # Health bar
-    pygame.draw.rect(WIN, RED, (WIDTH//2 - 200, 20, 400, 25))
-    pygame.draw.rect(WIN, GREEN, (WIDTH//2 - 200, 20, 4*health, 25))
-
-    # Score
-    WIN.blit(font.render(f"Score: {score}", True, WHITE), (WIDTH//2 - 50, 55))
-
-    # Timer
-    if MISSION_TIME:
-        elapsed = int(time.time() - start_time)
-        remaining = max(0, MISSION_TIME - elapsed)
-        WIN.blit(font.render(f"Time: {remaining}s", True, WHITE), (WIDTH//2 - 50, 80))
-
-    # Event lists
-    margin_top = 120
-    spacing_x = 20
-    panel_width = 400
-    total_width = 3 * panel_width + 2 * spacing_x
-    start_x = (WIDTH - total_width) // 2
-
-    draw_event_list(incoming_events, "Incoming Events", start_x, margin_top, "incoming", incoming_rects)
-    draw_event_list(active_events, "Active Events", start_x + panel_width + spacing_x, margin_top, "active", active_rects, show_timer=True)
-    draw_event_list(queued_events, "Queued Events", start_x + 2*(panel_width + spacing_x), margin_top, "queue", queue_rects)
-
-    # Logs
-    WIN.blit(font.render("System Logs", True, ORANGE), (WIDTH//2 - 100, 400))
-    log_area = pygame.Rect(WIDTH//2 - 480, 430, 960, 200)
-    pygame.draw.rect(WIN, (40, 40, 40), log_area)
-    pygame.draw.rect(WIN, WHITE, log_area, 1)
-    for i, entry in enumerate(logs[-7:]):
-        if isinstance(entry, tuple):
-            log, color = entry
-        else:
-            log, color = entry, WHITE
-        WIN.blit(font.render(log, True, color), (log_area.x + 10, log_area.y + 5 + i*22))
-
-    # Buttons
-    for btn in buttons:
-        btn.draw(WIN, font)
+    global full_redraw
+    state = sim.state
+    t = time.perf_counter()
+    if full_redraw:
+        WIN.fill(BACKGROUND)
+        for region in ui_regions.values():
+            region.invalidate()
+
+    rects = refresh_regions(WIN, [
+        (ui_regions["health"], state.health),
+        (ui_regions["status"], (state.score, sim.remaining_time(), autopilot and autopilot.policy)),
+        (ui_regions["incoming"], panel_key("incoming")),
+        (ui_regions["active"], panel_key("active")),
+        (ui_regions["queue"], panel_key("queue")),
+        (ui_regions["logs"], state.logs.next_seq),
+        (ui_regions["buttons"], tuple(btn.hover for btn in buttons)),
+    ])
+    if show_overlay:
+        rects.append(draw_profiler_overlay(WIN))
+    if profiler.enabled:
+        t = profiler.lap("draw_ui", t)
+
+    if full_redraw:
+        pygame.display.update()
+        full_redraw = False
+    elif rects:
+        pygame.display.update(rects)
+    if profiler.enabled:
+        profiler.lap("display.update", t)
+        profiler.frame_presented()
 
-    pygame.display.update()
+# ----------------------------
+# Profiler overlay
+# ----------------------------
+OVERLAY_REFRESH = 0.5  # seconds between percentile recomputes
+overlay_surface = None
+overlay_time = 0.0
+
+def draw_profiler_overlay(surface):
+    """Blits the p50/p95/p99 table (refreshed every OVERLAY_REFRESH s) and returns its rect."""
+    global overlay_surface, overlay_time
+    now = time.perf_counter()
+    if overlay_surface is None or now - overlay_time >= OVERLAY_REFRESH:
+        small = get_font(16)
+        lines = [f"{'phase':<28}{'p50':>7}{'p95':>7}{'p99':>7} ms"]
+        for name, stats in profiler.summary().items():
+            lines.append(f"{name:<28}{stats['p50_ms']:7.2f}{stats['p95_ms']:7.2f}{stats['p99_ms']:7.2f}")
+        line_height = small.get_linesize()
+        overlay_surface = pygame.Surface((max(small.size(l)[0] for l in lines) + 12,
+                                          len(lines) * line_height + 8))
+        overlay_surface.fill(BLACK)
+        for i, line in enumerate(lines):
+            overlay_surface.blit(small.render(line, True, GREEN), (6, 4 + i * line_height))
+        overlay_time = now
+    return surface.blit(overlay_surface, (10, 10))
+
+def set_profiling(enabled):
+    profiler.enabled = enabled
+    sim.profiler = profiler if enabled else None
+
+def toggle_overlay():
+    global show_overlay
+    show_overlay = not show_overlay
+    if show_overlay:
+        set_profiling(True)
+    else:
+        set_profiling(profile_path is not None)
+        invalidate_ui()  # erase the overlay
+
+def export_profile():
+    if profiler.enabled:
+        profiler.export(profile_path or "profile.json")
 
 # ----------------------------
 # Main Menu
 # ----------------------------
-def draw_menu():
-    WIN.fill((20, 20, 20))
-    title_font = get_font(48)
-    WIN.blit(title_font.render("Rover Event Control", True, ORANGE), (WIDTH//2 - 220, 150))
+menu_buttons = []
+over_buttons = []
 
-    menu_buttons = [
+def build_screens():
+    """Menu and game-over buttons, created once per layout."""
+    menu_buttons[:] = [
         Button((WIDTH//2 - 100, 300, 200, 50), "Play (5 min)", start_game_5min),
         Button((WIDTH//2 - 100, 370, 200, 50), "Play (Infinite)", start_game_infinite),
         Button((WIDTH//2 - 100, 440, 200, 50), "Quit", lambda: sys.exit())
     ]
+    over_buttons[:] = [
+        Button((WIDTH//2 - 120, 360, 240, 50), "Return to Main Menu", return_to_menu),
+        Button((WIDTH//2 - 120, 430, 240, 50), "Exit to Desktop", lambda: sys.exit())
+    ]
+    build_routers()
 
+def draw_menu():
+    WIN.fill((20, 20, 20))
+    WIN.blit(render_text("Rover Event Control", 48, ORANGE), (WIDTH//2 - 220, 150))
     for btn in menu_buttons:
-        btn.draw(WIN, font)
+        btn.draw(WIN, FONT_SIZE)
     pygame.display.update()
-    return menu_buttons
+
+def begin_session(**fields):
+    if telemetry:
+        telemetry.begin_session(sim.seed, mission_time=sim.state.mission_time, **fields)
 
 def start_game_5min():
-    global current_state, MISSION_TIME
-    reset_game()
-    MISSION_TIME = 300
+    global current_state
+    reset_game(300)
+    begin_session()
+    invalidate_ui()
     current_state = STATE_PLAYING
 
 def start_game_infinite():
-    global current_state, MISSION_TIME
-    reset_game()
-    MISSION_TIME = None
+    global current_state
+    reset_game(None)
+    begin_session()
+    start_checkpoints()
+    invalidate_ui()
+    current_state = STATE_PLAYING
+
+def resume_game():
+    """Continues the checkpointed session. Returns False if there is none to load."""
+    global current_state, recorder
+    reset_game(None)
+    try:
+        snapshot.load(sim, snapshot_path)
+    except (OSError, ValueError) as exc:
+        print(f"Cannot resume from {snapshot_path}: {exc}", file=sys.stderr)
+        sim.reset(None)
+        return False
+    recorder = None  # a recording has to start from the seed, not mid-session
+    begin_session(resumed_at_tick=sim.state.tick)
+    start_checkpoints()
+    invalidate_ui()
     current_state = STATE_PLAYING
+    return True
+
+# ----------------------------
+# Checkpoints
+# ----------------------------
+def start_checkpoints():
+    global snapshot_writer, last_snapshot_tick
+    if snapshot_writer is None:
+        snapshot_writer = snapshot.SnapshotWriter(snapshot_path)
+    last_snapshot_tick = sim.state.tick
+
+def checkpoint():
+    """Serialises the session here (well under a millisecond); the writer thread does the I/O."""
+    global last_snapshot_tick
+    start = time.perf_counter()
+    snapshot_writer.submit(snapshot.dumps(sim))
+    last_snapshot_tick = sim.state.tick
+    if profiler.enabled:
+        profiler.lap("snapshot", start)
+
+def stop_checkpoints(keep):
+    """keep=False deletes the checkpoint too, once the session is over."""
+    global snapshot_writer
+    if snapshot_writer is None:
+        return
+    if keep:
+        checkpoint()
+    else:
+        snapshot_writer.discard()
+    snapshot_writer.close()
+    snapshot_writer = None
 
 # ----------------------------
 # Game Over Screen
 # ----------------------------
 def draw_game_over(message):
     WIN.fill((10, 10, 10))
-    title_font = get_font(48)
-    WIN.blit(title_font.render(message, True, WHITE), (WIDTH//2 - 200, 200))
-    WIN.blit(font.render(f"Final Score: {score}", True, WHITE), (WIDTH//2 - 80, 280))
-
-    over_buttons = [
-        Button((WIDTH//2 - 120, 360, 240, 50), "Return to Main Menu", return_to_menu),
-        Button((WIDTH//2 - 120, 430, 240, 50), "Exit to Desktop", lambda: sys.exit())
-    ]
-
+    WIN.blit(render_text(message, 48, WHITE), (WIDTH//2 - 200, 200))
+    WIN.blit(render_text(f"Final Score: {sim.state.score}", FONT_SIZE, WHITE), (WIDTH//2 - 80, 280))
+    draw_standing(WIDTH - 400, 200)
     for btn in over_buttons:
-        btn.draw(WIN, font)
+        btn.draw(WIN, FONT_SIZE)
     pygame.display.update()
-    return over_buttons
+
+def draw_standing(x, y):
+    """Leaderboard panel; a placeholder until the worker thread has answered."""
+    global standing_drawn
+    if standing is None:
+        return
+    if not standing.done():
+        WIN.blit(render_text("Loading leaderboard...", FONT_SIZE, WHITE), (x, y))
+        return
+    standing_drawn = True
+    if standing.exception() is not None:
+        WIN.blit(render_text("Leaderboard unavailable", FONT_SIZE, WHITE), (x, y))
+        return
+    result = standing.result()
+    WIN.blit(render_text(f"Top {len(result['top'])} - {result['mode']}", FONT_SIZE, ORANGE), (x, y))
+    for i, (score, *_rest) in enumerate(result["top"]):
+        WIN.blit(render_text(f"{i + 1:>2}. {score}", FONT_SIZE, WHITE), (x, y + 30 + i * 26))
+    y += 40 + len(result["top"]) * 26
+    WIN.blit(render_text(f"This run: #{result['rank']} of {result['count']}", FONT_SIZE, GREEN), (x, y))
+    WIN.blit(render_text(f"Better than {result['percentile']:.0f}% of runs", FONT_SIZE, GREEN), (x, y + 26))
+
+def record_score():
+    """Stores the finished run; the game-over screen shows its standing when ready."""
+    global leaderboard, standing, standing_drawn
+    if leaderboard_path is None:
+        return
+    if leaderboard is None:
+        leaderboard = LeaderboardService(leaderboard_path)
+    s = sim.state
+    standing = leaderboard.finish_run(mode_for(s.mission_time), s.score, health=s.health,
+                                      elapsed=round(s.elapsed, 3), seed=sim.seed)
+    standing_drawn = False
 
 def return_to_menu():
     global current_state
     current_state = STATE_MENU
+    invalidate_ui()
 
 # ----------------------------
 # Input
 # ----------------------------
-def handle_click(pos):
+routers = {}  # game state -> InputRouter, rebuilt with the layout
+
+def select_row(list_name, rect_store, row):
     global selected_event, selected_list
-    for rect, ev in incoming_rects:
-        if rect.collidepoint(pos):
-            selected_event, selected_list = ev, "incoming"
-            return
-    for rect, ev in active_rects:
-        if rect.collidepoint(pos):
-            selected_event, selected_list = ev, "active"
-            return
-    for rect, ev in queue_rects:
-        if rect.collidepoint(pos):
-            selected_event, selected_list = ev, "queue"
-            return
+    if row < len(rect_store):
+        selected_event, selected_list = rect_store[row][1], list_name
+
+def build_routers():
+    """Click targets and keymaps for every screen (needs the layout built first)."""
+    play = InputRouter({
+        pygame.K_h: honor_event,
+        pygame.K_r: reject_event,
+        pygame.K_q: queue_event,
+        pygame.K_s: execute_from_queue,
+        pygame.K_t: terminate_event,
+        pygame.K_m: modify_priority,
+        pygame.K_n: modify_priority_down,
+        pygame.K_a: toggle_autopilot,
+        pygame.K_F3: toggle_overlay,
+        pygame.K_F4: export_profile,
+        pygame.K_F11: toggle_fullscreen,
+    })
+    panels = [("incoming", incoming_rects), ("active", active_rects), ("queue", queue_rects)]
+    for i, (list_name, rect_store) in enumerate(panels):
+        for row in range(PANEL_ROWS):
+            rect = (panel_x(i), PANEL_TOP + 30 + row * ROW_SPACING, PANEL_WIDTH, ROW_HEIGHT)
+            play.add(rect, lambda list_name=list_name, rect_store=rect_store, row=row:
+                     select_row(list_name, rect_store, row))
+        play.add_scroll(ui_regions[list_name].rect, lambda steps, list_name=list_name: scroll_panel(list_name, steps))
     for btn in buttons:
-        if btn.rect.collidepoint(pos):
-            btn.action()
+        play.add_button(btn)
+
+    routers.clear()
+    routers[STATE_PLAYING] = play
+    for state, screen_buttons in ((STATE_MENU, menu_buttons), (STATE_GAME_OVER, over_buttons)):
+        routers[state] = InputRouter({pygame.K_F11: toggle_fullscreen})
+        for btn in screen_buttons:
+            routers[state].add_button(btn)
+
+def toggle_fullscreen():
+    pygame.display.toggle_fullscreen()
+    invalidate_ui()
+
+def handle_click(pos):
+    routers[STATE_PLAYING].click(pos)
+
+def route_input(router, events):
+    """
+    Dispatches a frame's events through router. Mouse motion is coalesced to
+    the last position, so a flood of it costs one hit test per frame.
+    Returns True if anything on screen changed.
+    """
+    changed = False
+    motion = None
+    for event in events:
+        if event.type == pygame.QUIT:
+            quit_game()
+        elif event.type == pygame.VIDEOEXPOSE:
+            invalidate_ui()
+            changed = True
+        elif event.type == pygame.MOUSEMOTION:
+            motion = event
+        else:
+            changed = router.dispatch(event) or changed
+    if motion is not None:
+        changed = router.motion(motion.pos) or changed
+    return changed
+
+def quit_game():
+    save_recording()
+    stop_checkpoints(keep=True)
+    if telemetry:
+        if current_state == STATE_PLAYING:
+            telemetry.emit("quit", tick=sim.state.tick, score=sim.state.score, health=sim.state.health)
+        telemetry.close()
+    if leaderboard:
+        leaderboard.close()
+    if spectator:
+        spectator.close()
+    if profile_path:
+        export_profile()
+    pygame.quit(); sys.exit()
 
 # ----------------------------
 # Game Loop
 # ----------------------------
-clock = pygame.time.Clock()
-spawn_timer = 0
-menu_buttons = []
-over_buttons = []
-
-running = True
-while running:
-    clock.tick(60)
-
-    if current_state == STATE_MENU:
-        menu_buttons = draw_menu()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                for btn in menu_buttons:
-                    if btn.rect.collidepoint(event.pos):
-                        btn.action()
-
-    elif current_state == STATE_PLAYING:
-        spawn_timer += 1
-        elapsed = int(time.time() - start_time)
-
-        # Spawn new event every 3s
-        if spawn_timer >= 180:
-            incoming_events.append(generate_random_event(event_id_counter))
-            event_id_counter += 1
-            spawn_timer = 0
-
-        # Expire incoming events
-        for ev in incoming_events[:]:
-            ev.expire_time -= 1/60
-            if ev.expire_time <= 0:
-                incoming_events.remove(ev)
-                health -= ev.impact
-                logs.append(f"Missed: {ev.hint_text()} (-{ev.impact} HP)")
-
-        # Decrement active events timer
-        for ev in active_events[:]:
-            ev.duration -= 1/60
-            if ev.duration <= 0:
-                active_events.remove(ev)
-                score += ev.benefit
-                logs.append(f"Completed: {ev.hint_text()} (+{ev.benefit} pts)")
-
-        # Generate logs every 0.5s
-        if time.time() - last_log_time >= 0.5:
-            logs.append(generate_log())
-            if len(logs) > 30:
-                logs.pop(0)
-            last_log_time = time.time()
-
-        # Random healing mini-game
-        if elapsed >= next_heal_trigger:
-            if trigger_minigame():
-                health = min(100, health + 15)
-                logs.append("Healing mini-game success! +15 HP")
-            next_heal_trigger = elapsed + (random.randint(10,20) if health < 30 else random.randint(20,40))
-
-        # Check fail/win
-        if health <= 0 or (MISSION_TIME and elapsed >= MISSION_TIME):
-            message = "MISSION SUCCESS!" if health > 0 else "ROVER FAILURE!"
-            current_state = STATE_GAME_OVER
-            game_over_message = message
-
-        # Input
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                handle_click(event.pos)
-            if event.type == pygame.MOUSEMOTION:
-                for btn in buttons:
-                    btn.handle_event(event)
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_h: honor_event()
-                elif event.key == pygame.K_r: reject_event()
-                elif event.key == pygame.K_q: queue_event()
-                elif event.key == pygame.K_s: execute_from_queue()
-                elif event.key == pygame.K_t: terminate_event()
-                elif event.key == pygame.K_m: modify_priority()
-                elif event.key == pygame.K_n: modify_priority_down()
-
-        draw_ui()
-
-    elif current_state == STATE_GAME_OVER:
-        over_buttons = draw_game_over(game_over_message)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                for btn in over_buttons:
-                    if btn.rect.collidepoint(event.pos):
-                        btn.action()
\ No newline at end of file
+def update_game(dt):
+    """
+    Feeds queued player input into the simulation for one fixed step and
+    starts a mini-game scene if the simulation asks for one.
+    """
+    global selected_event, selected_list, current_state, minigame_scene
+    if replaying is not None:
+        for reason, success in replaying.minigames_at(sim.state.tick):
+            sim.resolve_minigame(reason, success)
+    manual = pending_actions[:]
+    pending_actions.clear()
+    actions = manual + autopilot(sim) if autopilot and replaying is None else manual
+    tick = sim.state.tick
+    if recorder:
+        recorder.actions(tick, actions)
+    if manual and profiler.enabled:
+        profiler.input_applied()
+    state = sim.step(dt, actions)
+    if autopilot:
+        for _, event_id in manual:
+            autopilot.touch(event_id)  # moved or re-prioritised by hand
+
+    if state.pending_minigames and minigame_scene is None and replaying is None:
+        trigger_minigame()
+
+    # Drop the selection once its event has left the list it was picked from
+    if selected_event is not None:
+        list_name, _ = sim.find_event(selected_event.id)
+        if list_name != selected_list:
+            selected_event, selected_list = None, None
+
+    if state.game_over:
+        current_state = STATE_GAME_OVER
+        minigame_scene = None
+        invalidate_ui()
+        save_recording()
+        stop_checkpoints(keep=False)
+        if profile_path:
+            export_profile()
+        if replaying is None:
+            record_score()
+    elif snapshot_writer and state.tick - last_snapshot_tick >= SNAPSHOT_INTERVAL * tick_rate:
+        checkpoint()
+
+def save_recording():
+    global recorder
+    if recorder:
+        recorder.finish(sim.state)
+        recorder.save(record_path)
+        recorder = None
+
+def load_recorded_catalog(recording, path=None):
+    """
+    The event catalog a recording was made with, from path if given (e.g.
+    the file was moved) or the recorded one. Raises ValueError if its
+    content differs from what was recorded.
+    """
+    recorded = recording.catalog or {}
+    path = path or recorded.get("path")
+    catalog = EventCatalog.load(path) if path else default_catalog()
+    if recorded.get("digest") and catalog.digest != recorded["digest"]:
+        raise ValueError(f"Event catalog {path or 'event_catalog.json'} differs from the one recorded")
+    return catalog
+
+def run_replay(path, render=True, catalog=None):
+    """
+    Plays a recording back through update_game()/draw_ui() as fast as
+    possible and returns timing stats, for comparing versions. catalog
+    overrides where to find the recorded event catalog.
+    """
+    global replaying, tick_rate, current_state
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    recording = Recording.load(path)
+    sim.config.catalog = load_recorded_catalog(recording, catalog)
+    replaying = recording
+    tick_rate = recording.tick_rate
+    if render:
+        init_display()
+    reset_game(recording.mission_time, recording.seed)
+    current_state = STATE_PLAYING
+    dt = 1 / tick_rate
+
+    tick_cost = frame_cost = 0.0
+    while current_state == STATE_PLAYING and sim.state.tick < recording.ticks:
+        pending_actions.extend(recording.actions_at(sim.state.tick))
+        start = time.perf_counter()
+        update_game(dt)
+        mid = time.perf_counter()
+        if render and current_state == STATE_PLAYING:
+            draw_ui()
+        frame_cost += time.perf_counter() - mid
+        tick_cost += mid - start
+    replaying = None
+
+    state = sim.state
+    ticks = max(1, state.tick)
+    return {
+        "ticks": state.tick,
+        "score": state.score,
+        "health": state.health,
+        "matches_recording": recording.final is None or recording.final == {
+            "tick": state.tick, "score": state.score, "health": state.health},
+        "tick_us": tick_cost / ticks * 1e6,
+        "frame_us": frame_cost / ticks * 1e6,
+    }
+
+startup_time = None  # seconds from launch to the first presented frame
+
+def report_startup():
+    global startup_time
+    startup_time = time.perf_counter() - LAUNCH_TIME
+    if profiler.enabled:
+        profiler.record("startup", startup_time)
+    if startup_time > STARTUP_BUDGET:
+        print(f"Startup took {startup_time * 1000:.0f} ms, over the {STARTUP_BUDGET * 1000:.0f} ms budget",
+              file=sys.stderr)
+
+def start_telemetry(path):
+    global telemetry
+    telemetry = TelemetryWriter(path)
+    sim.telemetry = telemetry.emit
+
+def start_spectator(address):
+    global spectator
+    from spectator import SpectatorServer, parse_address  # asyncio is a slow import; only load it when asked
+    try:
+        spectator = SpectatorServer(*parse_address(address)).start()
+    except OSError as exc:
+        print(f"Spectator server not started: {exc}", file=sys.stderr)
+
+def main(rate=TICK_RATE, render_fps=RENDER_FPS, resume=False):
+    global tick_rate, full_redraw
+    tick_rate = rate
+    if telemetry_path:
+        start_telemetry(telemetry_path)
+    if spectator_address:
+        start_spectator(spectator_address)
+    init_display()
+    if resume:
+        resume_game()
+    set_profiling(profile_path is not None)
+    clock = pygame.time.Clock()
+    timestep = FixedTimestep(tick_rate)
+    frame_budget = 1 / render_fps
+    last_time = time.perf_counter()
+
+    running = True
+    while running:
+        clock.tick(render_fps)
+        frame_start = time.perf_counter()
+        frame_time = frame_start - last_time
+        last_time = frame_start
+
+        if current_state in (STATE_MENU, STATE_GAME_OVER):
+            # Static screens: repaint only on entry or when a hover changes
+            timestep.reset()
+            changed = route_input(routers[current_state], pygame.event.get())
+            if current_state == STATE_MENU and (changed or full_redraw):
+                draw_menu()
+                full_redraw = False
+            elif current_state == STATE_GAME_OVER and (changed or full_redraw or
+                                                        (standing is not None and standing.done() and not standing_drawn)):
+                draw_game_over(sim.state.message)
+                full_redraw = False
+
+        elif current_state == STATE_PLAYING:
+            # Input (queued as actions for the next simulation step)
+            events = pygame.event.get()
+            in_minigame = minigame_scene is not None
+            if in_minigame:
+                for event in events:
+                    if event.type == pygame.QUIT:
+                        quit_game()  # the mini-game scene gets the rest of this frame's input
+            else:
+                queued = len(pending_actions)
+                route_input(routers[STATE_PLAYING], events)
+                if profiler.enabled and len(pending_actions) > queued:
+                    # Only input that queued an action reaches the simulation. pygame
+                    # events carry no timestamp; the poll time is the closest we get
+                    profiler.input_received(frame_start)
+            if profiler.enabled:
+                phase_start = profiler.lap("input", frame_start)
+
+            # Fixed-rate simulation, however long the last frame took
+            for _ in range(timestep.advance(frame_time)):
+                if minigame_scene is not None and PAUSE_SIM_DURING_MINIGAMES:
+                    break  # owed time is dropped, so the mission clock pauses too
+                update_game(timestep.dt)
+                if current_state != STATE_PLAYING:
+                    break
+            if profiler.enabled:
+                profiler.lap("update_game", phase_start)
+
+            # Draw unless the simulation is behind
+            update_cost = time.perf_counter() - frame_start
+            if current_state == STATE_PLAYING and minigame_scene is not None:
+                update_minigame(events if in_minigame else [], min(frame_time, MAX_CATCH_UP))
+            elif current_state == STATE_PLAYING and timestep.should_render(update_cost, frame_budget):
+                draw_ui()
+            if profiler.enabled:
+                profiler.lap("frame", frame_start)
+
+        if spectator:
+            spectator.publish(sim, STATE_NAMES[current_state])
+        if startup_time is None:
+            report_startup()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rover Event Control")
+    parser.add_argument("--seed", type=int, help="fixed seed for every session")
+    parser.add_argument("--record", metavar="PATH", help="save each session's inputs to PATH")
+    parser.add_argument("--replay", metavar="PATH", help="replay a recording headlessly and print timings")
+    parser.add_argument("--no-render", action="store_true", help="with --replay, skip drawing")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="collect per-phase timings and export them to PATH (.json or .csv)")
+    parser.add_argument("--snapshot", metavar="PATH", default=snapshot.DEFAULT_PATH,
+                        help="where infinite-mode checkpoints are kept")
+    parser.add_argument("--resume", action="store_true", help="continue the last checkpointed session")
+    parser.add_argument("--leaderboard", metavar="PATH", default=LEADERBOARD_PATH,
+                        help="SQLite leaderboard file (default: %(default)s)")
+    parser.add_argument("--no-leaderboard", action="store_true", help="don't store or show scores")
+    parser.add_argument("--telemetry", metavar="PATH",
+                        help="log gameplay events to PATH (JSONL, or SQLite for .db/.sqlite)")
+    parser.add_argument("--catalog", metavar="PATH",
+                        help="event catalog to spawn from (default: event_catalog.json); "
+                             "with --replay, where to find the recorded one")
+    parser.add_argument("--autopilot", choices=AUTOPILOT_POLICIES,
+                        help="start with the dispatch autopilot on, using this policy (A toggles it)")
+    parser.add_argument("--tictactoe", choices=DIFFICULTIES, help="tic-tac-toe opponent strength (default: easy)")
+    parser.add_argument("--spectate", metavar="[HOST:]PORT",
+                        help="serve the live game to remote displays (see spectator.py)")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.replay:
+        for name, value in run_replay(args.replay, render=not args.no_render, catalog=args.catalog).items():
+            print(f"{name}: {value}")
+    else:
+        session_seed = args.seed
+        record_path = args.record
+        profile_path = args.profile
+        snapshot_path = args.snapshot
+        telemetry_path = args.telemetry
+        leaderboard_path = None if args.no_leaderboard else args.leaderboard
+        spectator_address = args.spectate
+        if args.catalog:
+            catalog_path = os.path.abspath(args.catalog)
+            sim.config.catalog = EventCatalog.load(catalog_path)
+        if args.autopilot:
+            autopilot_policy = args.autopilot
+            toggle_autopilot()
+        if args.tictactoe:
+            import minigames
+            minigames.TicTacToe.difficulty = args.tictactoe
+        main(resume=args.resume)
@@ -1,298 +1,324 @@
-import pygame, random, time, sys
-from utils import WIDTH, HEIGHT
+import pygame, random
+from utils import WIDTH, HEIGHT, render_text
+from tictactoe import Board, choose_move, EMPTY, X, O
 
-# ---------------- Helper ----------------
+# ---------------- Scene base ----------------
 
-def show_message(surface, text, size=50, duration=1.5, color=(255,255,255)):
-    font = pygame.font.SysFont("consolas", size)
-    surface.fill((0,0,0))
-    msg = font.render(text, True, color)
-    rect = msg.get_rect(center=(WIDTH//2, HEIGHT//2))
-    surface.blit(msg, rect)
-    pygame.display.update()
-    pygame.time.wait(int(duration*1000))\
-    
-def get_user_input(surface, prompt="", font_size=50, max_time=7):
+class MiniGame:
     """
-    Displays a prompt and collects keyboard input with Enter.
-    Returns typed string or None on timeout.
+    A mini-game as a resumable scene. The main loop feeds it input with
+    handle_event(), advances it with update(dt) and renders it with
+    draw(surface) every frame until done is set; result is then True on
+    success. Nothing here blocks or owns a clock.
     """
-    font = pygame.font.SysFont("consolas", font_size)
-    clock = pygame.time.Clock()
-    input_str = ""
-    start_time = time.time()
-
-    while True:
-        # Timeout
-        if time.time() - start_time > max_time:
-            return None
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    return input_str
-                elif event.key == pygame.K_BACKSPACE:
-                    input_str = input_str[:-1]
-                elif event.key <= 127:  # printable chars
-                    input_str += event.unicode
-
-        # Draw prompt and typed text
-        surface.fill((0,0,0))
-        if prompt:
-            prompt_text = font.render(prompt, True, (255,255,255))
-            surface.blit(prompt_text, prompt_text.get_rect(center=(WIDTH//2, HEIGHT//2 - 50)))
-        typed_text = font.render(input_str, True, (0,255,0))
-        surface.blit(typed_text, typed_text.get_rect(center=(WIDTH//2, HEIGHT//2)))
-        pygame.display.update()
-        clock.tick(30)
 
-# ---------------- Mini-Games ----------------
+    intro = None  # (text, size, seconds) shown before play starts
 
-def click_target(surface):
-    clock = pygame.time.Clock()
-    target_radius = 30
-    target_pos = (random.randint(200, WIDTH-200), random.randint(200, HEIGHT-200))
-    start_time = time.time()
-    while time.time() - start_time < 3:  # 3s limit
-        clock.tick(60)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                mx, my = event.pos
-                if (mx - target_pos[0])**2 + (my - target_pos[1])**2 <= target_radius**2:
-                    return True
+    def __init__(self):
+        self.done = False
+        self.result = False
+        self.time = 0.0  # seconds of play, after the intro
+        self.intro_left = self.intro[2] if self.intro else 0.0
 
-        surface.fill((0,0,0))
-        pygame.draw.circle(surface, (255,0,0), target_pos, target_radius)
-        pygame.display.update()
-    return False
-
-def press_space(surface):
-    clock = pygame.time.Clock()
-    bar_x, bar_y = WIDTH//2 - 300, HEIGHT//2 - 20
-    bar_w, bar_h = 600, 40
-    target_zone = pygame.Rect(WIDTH//2-50, HEIGHT//2-20, 100, 40)
-    marker_x = bar_x
-    marker_speed = 8
-    while True:
-        clock.tick(60)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
-                return target_zone.left <= marker_x <= target_zone.right
-        marker_x += marker_speed
-        if marker_x > bar_x + bar_w or marker_x < bar_x:
-            marker_speed *= -1
+    def finish(self, result):
+        self.done = True
+        self.result = bool(result)
+
+    def handle_event(self, event):
+        if not self.done and self.intro_left <= 0:
+            self.on_event(event)
+
+    def update(self, dt):
+        if self.done:
+            return
+        if self.intro_left > 0:
+            self.intro_left -= dt
+            return
+        self.time += dt
+        self.on_update(dt)
 
+    def draw(self, surface):
         surface.fill((0,0,0))
-        pygame.draw.rect(surface, (255,255,255), (bar_x, bar_y, bar_w, bar_h), 2)
-        pygame.draw.rect(surface, (0,255,0), target_zone)
-        pygame.draw.rect(surface, (255,0,0), (marker_x, bar_y, 10, bar_h))
-        pygame.display.update()
-
-def catch_object(surface):
-    clock = pygame.time.Clock()
-    player = pygame.Rect(WIDTH//2-50, HEIGHT-100, 100, 20)
-    obj = pygame.Rect(random.randint(100, WIDTH-100), 0, 30, 30)
-    speed = 7
-    while True:
-        clock.tick(60)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
+        if self.intro_left > 0:
+            text, size, _ = self.intro
+            draw_centered(surface, text, size)
+        else:
+            self.on_draw(surface)
 
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT]: player.x -= 7
-        if keys[pygame.K_RIGHT]: player.x += 7
-        player.x = max(0, min(WIDTH-100, player.x))
+    # Overridden by each game
+    def on_event(self, event):
+        pass
 
-        obj.y += speed
-        if obj.colliderect(player):
-            return True
-        if obj.y > HEIGHT:
-            return False
+    def on_update(self, dt):
+        pass
 
-        surface.fill((0,0,0))
-        pygame.draw.rect(surface, (0,255,0), player)
-        pygame.draw.rect(surface, (255,0,0), obj)
-        pygame.display.update()
-
-def tic_tac_toe(surface):
-    # Setup
-    grid = [[None]*3 for _ in range(3)]
-    cell_size = 120
-    origin_x = WIDTH//2 - (3*cell_size)//2
-    origin_y = HEIGHT//2 - (3*cell_size)//2
-    font = pygame.font.SysFont("consolas", 80)
-    clock = pygame.time.Clock()
-    moves = 0
-
-    def check_winner():
-        for i in range(3):
-            if grid[i][0] == grid[i][1] == grid[i][2] != None:
-                return grid[i][0]
-            if grid[0][i] == grid[1][i] == grid[2][i] != None:
-                return grid[0][i]
-        if grid[0][0] == grid[1][1] == grid[2][2] != None:
-            return grid[0][0]
-        if grid[0][2] == grid[1][1] == grid[2][0] != None:
-            return grid[0][2]
-        return None
-
-    def ai_move():
-        empties = [(i,j) for i in range(3) for j in range(3) if grid[i][j] is None]
-        if empties:
-            i, j = random.choice(empties)
-            grid[i][j] = "O"
-
-    show_message(surface, "Tic Tac Toe: Win or Draw!", 40, 2)
-
-    start_time = time.time()
-    while time.time() - start_time < 15:
-        clock.tick(30)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                mx, my = event.pos
-                col = (mx - origin_x) // cell_size
-                row = (my - origin_y) // cell_size
-                if 0 <= row < 3 and 0 <= col < 3 and grid[row][col] is None:
-                    grid[row][col] = "X"
-                    moves += 1
-                    if not check_winner():
-                        ai_move()
-                        moves += 1
-
-        # Draw board
-        surface.fill((0,0,0))
+    def on_draw(self, surface):
+        pass
+
+# ---------------- Helper ----------------
+
+def draw_centered(surface, text, size=50, color=(255,255,255), dy=0):
+    msg = render_text(text, size, color)
+    surface.blit(msg, msg.get_rect(center=(WIDTH//2, HEIGHT//2 + dy)))
+
+class TextInput:
+    """Keyboard line input finished with Enter. submitted stays None until then."""
+
+    def __init__(self, prompt="", font_size=50):
+        self.prompt = prompt
+        self.font_size = font_size
+        self.text = ""
+        self.submitted = None
+
+    def handle_event(self, event):
+        if event.type != pygame.KEYDOWN or self.submitted is not None:
+            return
+        if event.key == pygame.K_RETURN:
+            self.submitted = self.text
+        elif event.key == pygame.K_BACKSPACE:
+            self.text = self.text[:-1]
+        elif event.key <= 127:  # printable chars
+            self.text += event.unicode
+
+    def draw(self, surface):
+        if self.prompt:
+            draw_centered(surface, self.prompt, self.font_size, dy=-50)
+        draw_centered(surface, self.text, self.font_size, (0,255,0))
+
+# ---------------- Mini-Games ----------------
+
+class ClickTarget(MiniGame):
+    """A target appears at a random position; click it within 3s."""
+
+    def __init__(self):
+        super().__init__()
+        self.radius = 30
+        self.pos = (random.randint(200, WIDTH-200), random.randint(200, HEIGHT-200))
+
+    def on_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            mx, my = event.pos
+            if (mx - self.pos[0])**2 + (my - self.pos[1])**2 <= self.radius**2:
+                self.finish(True)
+
+    def on_update(self, dt):
+        if self.time >= 3:
+            self.finish(False)
+
+    def on_draw(self, surface):
+        pygame.draw.circle(surface, (255,0,0), self.pos, self.radius)
+
+class PressSpace(MiniGame):
+    """A marker sweeps a bar; press space while it is in the green zone."""
+
+    def __init__(self):
+        super().__init__()
+        self.bar = pygame.Rect(WIDTH//2 - 300, HEIGHT//2 - 20, 600, 40)
+        self.target_zone = pygame.Rect(WIDTH//2-50, HEIGHT//2-20, 100, 40)
+        self.marker_x = self.bar.x
+        self.speed = 480  # px/s
+
+    def on_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+            self.finish(self.target_zone.left <= self.marker_x <= self.target_zone.right)
+
+    def on_update(self, dt):
+        self.marker_x += self.speed * dt
+        if self.marker_x > self.bar.right or self.marker_x < self.bar.left:
+            self.speed *= -1
+
+    def on_draw(self, surface):
+        pygame.draw.rect(surface, (255,255,255), self.bar, 2)
+        pygame.draw.rect(surface, (0,255,0), self.target_zone)
+        pygame.draw.rect(surface, (255,0,0), (self.marker_x, self.bar.y, 10, self.bar.height))
+
+class CatchObject(MiniGame):
+    """Move left/right to catch a falling object before it hits the ground."""
+
+    def __init__(self):
+        super().__init__()
+        self.player = pygame.Rect(WIDTH//2-50, HEIGHT-100, 100, 20)
+        self.obj = pygame.Rect(random.randint(100, WIDTH-100), 0, 30, 30)
+        self.player_x = float(self.player.x)
+        self.obj_y = 0.0
+        self.speed = 420  # px/s, for both player and object
+
+    def on_update(self, dt):
+        keys = pygame.key.get_pressed()
+        if keys[pygame.K_LEFT]: self.player_x -= self.speed * dt
+        if keys[pygame.K_RIGHT]: self.player_x += self.speed * dt
+        self.player_x = max(0, min(WIDTH-100, self.player_x))
+        self.player.x = int(self.player_x)
+
+        self.obj_y += self.speed * dt
+        self.obj.y = int(self.obj_y)
+        if self.obj.colliderect(self.player):
+            self.finish(True)
+        elif self.obj.y > HEIGHT:
+            self.finish(False)
+
+    def on_draw(self, surface):
+        pygame.draw.rect(surface, (0,255,0), self.player)
+        pygame.draw.rect(surface, (255,0,0), self.obj)
+
+class TicTacToe(MiniGame):
+    """Classic 3x3 game vs the AI within 15s; win or draw = success."""
+
+    intro = ("Tic Tac Toe: Win or Draw!", 40, 2)
+    difficulty = "easy"  # opponent tier, see tictactoe.DIFFICULTIES (main.py --tictactoe)
+    MARKS = {X: "X", O: "O"}
+
+    def __init__(self, difficulty=None):
+        super().__init__()
+        self.board = Board()
+        self.difficulty = difficulty or self.difficulty
+        self.cell_size = 120
+        self.origin_x = WIDTH//2 - (3*self.cell_size)//2
+        self.origin_y = HEIGHT//2 - (3*self.cell_size)//2
+
+    def ai_move(self):
+        self.board.play(choose_move(self.board, self.difficulty), O)
+
+    def on_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            mx, my = event.pos
+            col = (mx - self.origin_x) // self.cell_size
+            row = (my - self.origin_y) // self.cell_size
+            if 0 <= row < 3 and 0 <= col < 3 and self.board.cells[row*3 + col] == EMPTY:
+                self.board.play(row*3 + col, X)
+                if not self.board.over:
+                    self.ai_move()
+
+    def on_update(self, dt):
+        board = self.board
+        if board.winner == X: self.finish(True)
+        elif board.winner == O: self.finish(False)
+        elif board.over: self.finish(True)  # draw ok
+        elif self.time >= 15: self.finish(False)
+
+    def on_draw(self, surface):
         for r in range(3):
             for c in range(3):
-                rect = pygame.Rect(origin_x + c*cell_size, origin_y + r*cell_size, cell_size, cell_size)
+                rect = pygame.Rect(self.origin_x + c*self.cell_size, self.origin_y + r*self.cell_size,
+                                   self.cell_size, self.cell_size)
                 pygame.draw.rect(surface, (255,255,255), rect, 2)
-                if grid[r][c]:
-                    text = font.render(grid[r][c], True, (255,255,255))
-                    text_rect = text.get_rect(center=rect.center)
-                    surface.blit(text, text_rect)
-
-        pygame.display.update()
+                mark = self.board.cells[r*3 + c]
+                if mark != EMPTY:
+                    text = render_text(self.MARKS[mark], 80, (255,255,255))
+                    surface.blit(text, text.get_rect(center=rect.center))
 
-        winner = check_winner()
-        if winner == "X": return True
-        elif winner == "O": return False
-        elif moves == 9: return True  # draw ok
+class InputChallenge(MiniGame):
+    """
+    Shared flow for the typed-answer games: intro, then the challenge text
+    for show_time seconds, then a prompt with max_time seconds to answer.
+    """
 
-    return False
+    prompt = ""
+    show_time = 0
+    max_time = 7
+    keep_challenge = True  # leave the challenge visible above the prompt
 
-def number_memory(surface):
-    numbers = [random.randint(0,9) for _ in range(4)]
-    seq = "".join(map(str, numbers))
+    def __init__(self, challenge, answer, size=60):
+        super().__init__()
+        self.challenge = challenge
+        self.answer = answer
+        self.size = size
+        self.input = TextInput(self.prompt)
 
-    show_message(surface, "Memorize the numbers!", 40, 2)
-    font = pygame.font.SysFont("consolas", 50)
+    def answering(self):
+        return self.time >= self.show_time
 
-    # Show numbers
-    surface.fill((0,0,0))
-    msg = font.render(" ".join(seq), True, (255,255,255))
-    surface.blit(msg, msg.get_rect(center=(WIDTH//2, HEIGHT//2)))
-    pygame.display.update()
-    pygame.time.wait(2000)
+    def on_event(self, event):
+        if self.answering():
+            self.input.handle_event(event)
+            if self.input.submitted is not None:
+                self.finish(self.input.submitted == self.answer)
 
-    # Get input
-    ans = get_user_input(surface, "Enter the numbers:")
+    def on_update(self, dt):
+        if self.time - self.show_time > self.max_time:
+            self.finish(False)
 
-    return ans == seq
+    def on_draw(self, surface):
+        if not self.answering():
+            draw_centered(surface, self.challenge, self.size)
+            return
+        if self.keep_challenge:
+            draw_centered(surface, self.challenge, self.size, dy=-130)
+        self.input.draw(surface)
 
-def quick_math(surface):
-    a, b = random.randint(1,9), random.randint(1,9)
-    correct_answer = str(a + b)
+class NumberMemory(InputChallenge):
+    """Memorize a sequence of numbers briefly, then input them."""
 
-    show_message(surface, "Solve Quickly!", 40, 2)
-    font = pygame.font.SysFont("consolas", 60)
+    intro = ("Memorize the numbers!", 40, 2)
+    prompt = "Enter the numbers:"
+    show_time = 2
+    keep_challenge = False
 
-    # Show question
-    surface.fill((0,0,0))
-    msg = font.render(f"{a} + {b} = ?", True, (255,255,255))
-    surface.blit(msg, msg.get_rect(center=(WIDTH//2, HEIGHT//2)))
-    pygame.display.update()
+    def __init__(self):
+        seq = "".join(str(random.randint(0,9)) for _ in range(4))
+        super().__init__(" ".join(seq), seq, size=50)
 
-    # Get input
-    ans = get_user_input(surface, "Your answer:")
+class QuickMath(InputChallenge):
+    """Solve a simple arithmetic problem under a time limit."""
 
-    return ans == correct_answer
+    intro = ("Solve Quickly!", 40, 2)
+    prompt = "Your answer:"
 
-def typing_challenge(surface):
-    words = ["mars","rover","sample","signal","dust"]
-    word = random.choice(words)
+    def __init__(self):
+        a, b = random.randint(1,9), random.randint(1,9)
+        super().__init__(f"{a} + {b} = ?", str(a + b))
 
-    show_message(surface, "Type the word shown!", 40, 2)
-    font = pygame.font.SysFont("consolas", 60)
+class TypingChallenge(InputChallenge):
+    """Type the displayed word accurately within the time limit."""
 
-    # Show word
-    surface.fill((0,0,0))
-    msg = font.render(word, True, (255,255,255))
-    surface.blit(msg, msg.get_rect(center=(WIDTH//2, HEIGHT//2)))
-    pygame.display.update()
+    intro = ("Type the word shown!", 40, 2)
+    prompt = "Type it exactly:"
 
-    # Get input
-    ans = get_user_input(surface, "Type it exactly:")
+    def __init__(self):
+        word = random.choice(["mars","rover","sample","signal","dust"])
+        super().__init__(word, word)
 
-    return ans == word
+class ColorMatch(MiniGame):
+    """Text names one color but is drawn in another; press R/G/B for the word within 5s."""
 
-def color_match(surface):
+    intro = ("Press R/G/B for WORD (not color)", 30, 2)
     colors = [("RED",(255,0,0)),("GREEN",(0,255,0)),("BLUE",(0,0,255))]
-    word, _ = random.choice(colors)
-    mismatch_color = random.choice([c[1] for c in colors])  # may or may not mismatch
-
-    show_message(surface, "Press R/G/B for WORD (not color)", 30, 2)
-    font = pygame.font.SysFont("consolas", 60)
-
-    # Show color word
-    surface.fill((0,0,0))
-    msg = font.render(word, True, mismatch_color)
-    surface.blit(msg, msg.get_rect(center=(WIDTH//2, HEIGHT//2)))
-    pygame.display.update()
-
-    # Wait for keypress
-    start_time = time.time()
-    while True:
-        if time.time() - start_time > 5:  # timeout
-            return False
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_r and word == "RED":
-                    return True
-                if event.key == pygame.K_g and word == "GREEN":
-                    return True
-                if event.key == pygame.K_b and word == "BLUE":
-                    return True
-                else:
-                    return False
+    keys = {"RED": pygame.K_r, "GREEN": pygame.K_g, "BLUE": pygame.K_b}
+
+    def __init__(self):
+        super().__init__()
+        self.word, _ = random.choice(self.colors)
+        self.mismatch_color = random.choice([c[1] for c in self.colors])  # may or may not mismatch
+
+    def on_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            self.finish(event.key == self.keys[self.word])
+
+    def on_update(self, dt):
+        if self.time > 5:  # timeout
+            self.finish(False)
+
+    def on_draw(self, surface):
+        draw_centered(surface, self.word, 60, self.mismatch_color)
 
 # ---------------- Game Picker ----------------
 
 minigames = [
-    click_target,
-    press_space,
-    catch_object,
-    tic_tac_toe,
-    number_memory,
-    quick_math,
-    typing_challenge,
-    color_match,
+    ClickTarget,
+    PressSpace,
+    CatchObject,
+    TicTacToe,
+    NumberMemory,
+    QuickMath,
+    TypingChallenge,
+    ColorMatch,
 ]
 
 """
 Click Target – A target appears at random position; click it in time.
 Press Space at Right Time – Bar with moving marker; hit space in green zone.
 Catch Falling Object – Move left/right to catch falling object before it hits ground.
-Tic Tac Toe – Classic 3×3 game vs simple AI; win or draw = success.
+Tic Tac Toe – Classic 3×3 game vs an AI of selectable strength; win or draw = success.
 Number Memory – Memorize a sequence of numbers briefly, then input them.
 Quick Math – Solve simple arithmetic problem under time limit.
 Typing Challenge – Type displayed word accurately within time.
@@ -302,6 +328,7 @@ Color Match – Text says one color but drawn in another; choose correct meaning
 last_minigame = None
 
 def get_random_minigame():
+    """Picks a mini-game class (never the same one twice in a row); instantiate it to play."""
     global last_minigame
     choices = [mg for mg in minigames if mg != last_minigame]
     chosen = random.choice(choices)
@@ -0,0 +1,89 @@
+import json, csv, time
+from collections import deque
+
+# ----------------------------
+# Frame profiler
+# ----------------------------
+INPUT_LATENCY = "input_latency"
+
+class FrameProfiler:
+    """
+    Rolling per-phase timings. Hot paths call lap(name, start), which records
+    the time since start and returns now, so back-to-back phases cost one
+    perf_counter() call each.
+    """
+
+    def __init__(self, window=600):
+        self.window = window
+        self.samples = {}  # phase -> deque of seconds
+        self.enabled = False
+        self._input_time = None    # oldest input not yet applied
+        self._applied_time = None  # oldest applied input not yet on screen
+
+    # ---------- Timing ----------
+
+    def record(self, name, seconds):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def lap(self, name, start):
+        now = time.perf_counter()
+        self.record(name, now - start)
+        return now
+
+    # ---------- Input-to-display latency ----------
+
+    def input_received(self, timestamp):
+        """Input has queued a simulation action; other input never reaches the screen through it."""
+        if self._input_time is None:
+            self._input_time = timestamp
+
+    def input_applied(self):
+        """Input has been fed to the simulation; its effect is in the next frame drawn."""
+        if self._input_time is not None and self._applied_time is None:
+            self._applied_time = self._input_time
+            self._input_time = None
+
+    def frame_presented(self):
+        if self._applied_time is not None:
+            self.record(INPUT_LATENCY, time.perf_counter() - self._applied_time)
+            self._applied_time = None
+
+    # ---------- Stats & export ----------
+
+    def percentiles(self, name, points=(50, 95, 99)):
+        """Percentiles in milliseconds for one phase (nearest-rank)."""
+        ordered = sorted(self.samples.get(name, ()))
+        if not ordered:
+            return tuple(0.0 for _ in points)
+        last = len(ordered) - 1
+        return tuple(ordered[min(last, int(p / 100 * len(ordered)))] * 1000 for p in points)
+
+    def summary(self):
+        return {
+            name: dict(zip(("p50_ms", "p95_ms", "p99_ms"), self.percentiles(name)), count=len(samples))
+            for name, samples in sorted(self.samples.items())
+        }
+
+    def export(self, path):
+        """Writes raw samples (ms) as CSV, or summary plus samples as JSON, by file extension."""
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["phase", "sample", "ms"])
+                for name, samples in sorted(self.samples.items()):
+                    for i, seconds in enumerate(samples):
+                        writer.writerow([name, i, f"{seconds * 1000:.4f}"])
+        else:
+            data = {
+                "summary": self.summary(),
+                "samples_ms": {name: [s * 1000 for s in samples] for name, samples in self.samples.items()},
+            }
+            with open(path, "w") as f:
+                json.dump(data, f, indent=2)
+
+    def clear(self):
+        self.samples.clear()
+        self._input_time = self._applied_time = None
@@ -0,0 +1,81 @@
+import json
+
+RECORDING_VERSION = 3
+
+# ----------------------------
+# Session recording
+# ----------------------------
+class Recorder:
+    """
+    Collects one session's player inputs keyed by simulation tick:
+    [tick, action, event_id] for actions applied in the step starting at
+    tick, and [tick, "minigame", reason, success] for mini-game results
+    applied before that step. Together with the seed and the event catalog
+    (catalog: {"path": file or None for the shipped one, "digest":
+    EventCatalog.digest}) this replays the session.
+    """
+
+    def __init__(self, seed, mission_time, tick_rate, catalog=None):
+        self.header = {
+            "version": RECORDING_VERSION,
+            "seed": seed,
+            "mission_time": mission_time,
+            "tick_rate": tick_rate,
+            "catalog": catalog,
+        }
+        self.inputs = []
+        self.final = None
+
+    def actions(self, tick, actions):
+        for name, event_id in actions:
+            self.inputs.append([tick, name, event_id])
+
+    def minigame(self, tick, reason, success):
+        self.inputs.append([tick, "minigame", reason, int(bool(success))])
+
+    def finish(self, state):
+        self.final = {"tick": state.tick, "score": state.score, "health": state.health}
+
+    def save(self, path):
+        data = dict(self.header, inputs=self.inputs, final=self.final)
+        with open(path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+
+class Recording:
+    """A loaded session recording, consumed tick by tick during replay."""
+
+    def __init__(self, data):
+        if data.get("version") != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version: {data.get('version')}")
+        self.seed = data["seed"]
+        self.mission_time = data["mission_time"]
+        self.tick_rate = data["tick_rate"]
+        self.catalog = data.get("catalog")  # None: the shipped catalog, unchecked
+        self.final = data.get("final")
+        self.actions_by_tick = {}
+        self.minigames_by_tick = {}
+        for item in data["inputs"]:
+            if item[1] == "minigame":
+                self.minigames_by_tick.setdefault(item[0], []).append((item[2], bool(item[3])))
+            else:
+                self.actions_by_tick.setdefault(item[0], []).append((item[1], item[2]))
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    @property
+    def ticks(self):
+        """Number of simulation steps the session ran for."""
+        if self.final:
+            return self.final["tick"]
+        return max(self.actions_by_tick, default=-1) + 1
+
+    def actions_at(self, tick):
+        return self.actions_by_tick.get(tick, [])
+
+    def minigames_at(self, tick):
+        """(reason, success) results to resolve before the step starting at tick."""
+        return self.minigames_by_tick.get(tick, [])
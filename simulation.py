@@ -0,0 +1,345 @@
+import random, time
+from events import default_catalog, EventStore, INCOMING, ACTIVE, QUEUED
+from logs import LogGenerator, LogBuffer
+
+# ----------------------------
+# Rules
+# ----------------------------
+MAX_ACTIVE_EVENTS = 5
+MISSION_TIME = 300          # default 5 min, None for infinite
+SPAWN_INTERVAL = 3.0        # seconds between new incoming events
+LOG_INTERVAL = 0.5          # seconds between system log lines
+MAX_LOGS = 30
+HONOR_MINIGAME_CHANCE = 0.3
+START_HEALTH = 100
+HEAL_TRIGGER = (20, 40)     # seconds until the next healing mini-game
+LOW_HEALTH_HEAL_TRIGGER = (10, 20)  # ... when health is below 30
+
+# Fixed-step timing
+TICK_RATE = 60              # simulation steps per second
+MAX_FRAME_SKIP = 5          # renders that may be skipped in a row under load
+MAX_CATCH_UP = 0.25         # seconds of real time simulated per frame at most
+
+# Player actions accepted by Simulation.step(), as (name, event_id) tuples
+ACTIONS = ("honor", "reject", "queue", "execute", "terminate", "priority_up", "priority_down")
+
+# Reasons a mini-game is requested
+MINIGAME_HONOR = "honor"
+MINIGAME_HEAL = "heal"
+
+
+class SimConfig:
+    """
+    Tunable rules for one Simulation. Defaults are the shipped game; stress
+    runs and balance sweeps change them through keyword overrides.
+    """
+
+    def __init__(self, **overrides):
+        self.spawn_interval = SPAWN_INTERVAL
+        self.max_active = MAX_ACTIVE_EVENTS
+        self.max_incoming = None  # None = unbounded; extra spawns are dropped
+        self.max_queued = None    # None = unbounded; queue actions refused when full
+        self.log_interval = LOG_INTERVAL
+        self.can_fail = True      # False keeps the mission running at any health
+        self.catalog = None       # events.EventCatalog; None = the shipped event_catalog.json
+        self.event_ranges = None  # {field: (low, high)} forced on every template, e.g. by sweeps
+        self.honor_minigame_chance = HONOR_MINIGAME_CHANCE
+        self.heal_trigger = HEAL_TRIGGER
+        self.low_health_heal_trigger = LOW_HEALTH_HEAL_TRIGGER
+        for name, value in overrides.items():
+            if not hasattr(self, name):
+                raise TypeError(f"Unknown simulation setting: {name}")
+            setattr(self, name, value)
+
+
+class GameState:
+    """All mutable state of one mission. Plain data, no pygame."""
+
+    def __init__(self, mission_time=MISSION_TIME, store_factory=EventStore, rng=random, config=None):
+        config = config or SimConfig()
+        self.mission_time = mission_time
+        self.tick = 0
+        self.event_id_counter = 1
+        self.events = store_factory()  # incoming / active / queued
+        self.health = START_HEALTH
+        self.score = 0
+        self.elapsed = 0.0
+        self.spawn_timer = 0.0
+        self.log_source = LogGenerator(rate=1 / config.log_interval, rng=rng)
+        self.spawned = 0
+        self.dropped_spawns = 0  # spawns refused because incoming was full
+        self.logs = LogBuffer(MAX_LOGS)
+        self.next_heal_trigger = rng.randint(*config.heal_trigger)
+        self.pending_minigames = []  # reasons waiting for resolve_minigame()
+        self.game_over = False
+        self.message = None
+
+
+class Simulation:
+    """
+    Headless game rules. The front end (or a bot) feeds player actions into
+    step() and resolves requested mini-games with resolve_minigame().
+    """
+
+    def __init__(self, mission_time=MISSION_TIME, store_factory=EventStore, seed=None, config=None):
+        # store_factory may be event_table.EventTable for array-backed runs
+        self.store_factory = store_factory
+        self.config = config or SimConfig()
+        self.profiler = None  # optional profiler.FrameProfiler for per-phase timings
+        self.telemetry = None  # optional emit(kind, **fields), e.g. telemetry.TelemetryWriter.emit
+        self.reset(mission_time, seed)
+
+    def reset(self, mission_time=MISSION_TIME, seed=None):
+        """
+        Starts a new mission. Every session gets a seed (random if not
+        given), so it can be replayed exactly from the seed and its inputs.
+        """
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        cfg = self.config
+        self.catalog = cfg.catalog or default_catalog()
+        if cfg.event_ranges:
+            self.catalog = self.catalog.with_ranges(cfg.event_ranges)
+        self.state = GameState(mission_time, self.store_factory, self.rng, self.config)
+        # event_table.EventTable settles due events in bulk through tick()/totals()/release()
+        self.vectorised = hasattr(self.state.events, "totals")
+
+    # ---------- Lookup ----------
+
+    def find_event(self, event_id):
+        """Returns (list_name, event) for an event id, or (None, None)."""
+        events = self.state.events
+        return events.location(event_id), events.get(event_id)
+
+    # ---------- Actions ----------
+
+    def apply_action(self, name, event_id):
+        s = self.state
+        events = s.events
+        list_name, ev = self.find_event(event_id)
+        if ev is None:
+            return False
+
+        if name == "honor":
+            if list_name != INCOMING or events.count(ACTIVE) >= self.config.max_active:
+                return False
+            events.move(event_id, ACTIVE)
+            s.logs.append(f"Honored: {ev.hint_text()} (P{ev.priority})")
+            if self.rng.random() < self.config.honor_minigame_chance:
+                s.pending_minigames.append(MINIGAME_HONOR)
+
+        elif name == "reject":
+            if list_name != INCOMING:
+                return False
+            events.remove(event_id)
+            s.health -= 5
+            s.logs.append(f"Rejected: {ev.hint_text()} (P{ev.priority})")
+
+        elif name == "queue":
+            max_queued = self.config.max_queued
+            if list_name != INCOMING or (max_queued is not None and events.count(QUEUED) >= max_queued):
+                return False
+            events.move(event_id, QUEUED)
+            s.logs.append(f"Queued: {ev.hint_text()} (P{ev.priority})")
+
+        elif name == "execute":
+            if list_name != QUEUED or events.count(ACTIVE) >= self.config.max_active:
+                return False
+            events.move(event_id, ACTIVE)
+            s.logs.append(f"Executed: {ev.hint_text()} (P{ev.priority})")
+
+        elif name == "terminate":
+            if list_name == ACTIVE:
+                fraction_completed = 1 - (ev.duration / ev.total_duration)
+                damage = 10 * (1 - fraction_completed) + 3 * fraction_completed
+                s.health -= int(damage)
+                events.remove(event_id)
+                s.logs.append(f"Terminated: {ev.hint_text()} (-{int(damage)} HP)")
+            elif list_name == QUEUED:
+                events.remove(event_id)
+                s.logs.append(f"Removed from Queue: {ev.hint_text()}")
+            else:
+                return False
+
+        elif name in ("priority_up", "priority_down"):
+            if list_name != QUEUED:
+                return False
+            ev.modify_priority(1 if name == "priority_up" else -1)
+
+        else:
+            raise ValueError(f"Unknown action: {name}")
+        return True
+
+    def resolve_minigame(self, reason, success):
+        """Applies the outcome of a mini-game requested by step()."""
+        s = self.state
+        if reason in s.pending_minigames:
+            s.pending_minigames.remove(reason)
+        if self.telemetry:
+            self.telemetry("minigame", tick=s.tick, reason=reason, success=bool(success))
+        if reason == MINIGAME_HONOR:
+            if success:
+                s.score += 10
+            else:
+                s.health -= 10
+        elif reason == MINIGAME_HEAL:
+            if success:
+                s.health = min(START_HEALTH, s.health + 15)
+                s.logs.append("Healing mini-game success! +15 HP")
+            elapsed = int(s.elapsed)
+            delay = self.config.low_health_heal_trigger if s.health < 30 else self.config.heal_trigger
+            s.next_heal_trigger = elapsed + self.rng.randint(*delay)
+
+    def resolve_pending(self, luck=None, skill=1.0):
+        """
+        Settles every mini-game step() is waiting on, for headless players:
+        each is won with chance skill, drawn from the random.Random luck
+        (always won without one).
+        """
+        for reason in list(self.state.pending_minigames):
+            self.resolve_minigame(reason, luck is None or luck.random() < skill)
+
+    # ---------- Tick ----------
+
+    def step(self, dt, actions=()):
+        """
+        Advances the mission by dt seconds after applying the given
+        (name, event_id) actions. Returns the GameState.
+        """
+        s = self.state
+        if s.game_over:
+            return s
+        prof = self.profiler
+        t = time.perf_counter() if prof else 0.0
+
+        tel = self.telemetry
+        for name, event_id in actions:
+            applied = self.apply_action(name, event_id)
+            if tel:
+                tel("action", tick=s.tick, action=name, event_id=event_id, applied=applied)
+        if prof: t = prof.lap("sim.actions", t)
+
+        s.tick += 1
+        s.elapsed += dt
+        s.spawn_timer += dt
+        elapsed = int(s.elapsed)
+
+        # Spawn new event every spawn_interval (several per step at stress rates)
+        cfg = self.config
+        due = 0
+        while s.spawn_timer >= cfg.spawn_interval:
+            s.spawn_timer -= cfg.spawn_interval
+            due += 1
+        if due:
+            room = due
+            if cfg.max_incoming is not None:
+                room = max(0, min(due, cfg.max_incoming - s.events.count(INCOMING)))
+            s.dropped_spawns += due - room
+            s.events.add_many(self.catalog.sample_many(room, s.event_id_counter, self.rng))
+            s.event_id_counter += room
+            s.spawned += room
+        if prof: t = prof.lap("sim.spawn", t)
+
+        # Expire incoming events / complete active ones (only those due)
+        events = s.events
+        if self.vectorised:
+            expired, completed = events.tick(dt)
+            lost, gained = events.totals(expired, completed)
+            s.health -= lost
+            s.score += gained
+            self._settle(events.describe(expired, "impact"), events.describe(completed, "benefit"))
+            events.release(expired, completed)
+        else:
+            expired, completed = events.advance(dt)
+            if expired or completed:
+                for ev in expired:
+                    s.health -= ev.impact
+                for ev in completed:
+                    s.score += ev.benefit
+                self._settle([(ev.id, ev.name, ev.priority, ev.category_hint, ev.impact) for ev in expired],
+                             [(ev.id, ev.name, ev.priority, ev.category_hint, ev.benefit) for ev in completed])
+        if prof: t = prof.lap("sim.expiry", t)
+
+        # Generate logs every log_interval
+        for message, color in s.log_source.due(dt):
+            s.logs.append(message, color)
+        if prof: t = prof.lap("sim.logs", t)
+
+        # Random healing mini-game
+        if elapsed >= s.next_heal_trigger and MINIGAME_HEAL not in s.pending_minigames:
+            s.pending_minigames.append(MINIGAME_HEAL)
+
+        # Check fail/win
+        if (s.health <= 0 and cfg.can_fail) or (s.mission_time and elapsed >= s.mission_time):
+            s.message = "MISSION SUCCESS!" if s.health > 0 else "ROVER FAILURE!"
+            s.game_over = True
+            if tel:
+                tel("mission_end", tick=s.tick, message=s.message, score=s.score, health=s.health,
+                    elapsed=round(s.elapsed, 3))
+
+        return s
+
+    def _settle(self, expired, completed):
+        """Logs (id, name, priority, hint, impact or benefit) rows of events that just left the store."""
+        s = self.state
+        tel = self.telemetry
+        for event_id, name, priority, hint, impact in expired:
+            s.logs.append(f"Missed: {hint} (-{impact} HP)")
+            if tel:
+                tel("expired", tick=s.tick, event_id=event_id, name=name, priority=priority, impact=impact)
+        for event_id, name, priority, hint, benefit in completed:
+            s.logs.append(f"Completed: {hint} (+{benefit} pts)")
+            if tel:
+                tel("completed", tick=s.tick, event_id=event_id, name=name, priority=priority, benefit=benefit)
+
+    def remaining_time(self):
+        s = self.state
+        if not s.mission_time:
+            return None
+        return max(0, s.mission_time - int(s.elapsed))
+
+
+class FixedTimestep:
+    """
+    Accumulator that turns variable real frame times into a whole number of
+    fixed simulation steps, so game outcomes do not depend on render rate.
+    """
+
+    def __init__(self, tick_rate=TICK_RATE, max_frame_skip=MAX_FRAME_SKIP, max_catch_up=MAX_CATCH_UP):
+        self.dt = 1 / tick_rate
+        self.max_frame_skip = max_frame_skip
+        self.max_catch_up = max_catch_up
+        self.accumulator = 0.0
+        self.skipped_in_row = 0
+        self.skipped_frames = 0
+        self.capped = False  # the last frame owed more than max_catch_up
+
+    def advance(self, frame_time):
+        """Adds real elapsed time and returns how many fixed steps are due."""
+        self.capped = frame_time > self.max_catch_up
+        self.accumulator += min(frame_time, self.max_catch_up)
+        steps = int(self.accumulator / self.dt)
+        self.accumulator -= steps * self.dt
+        return steps
+
+    def reset(self):
+        """Drops any owed time, e.g. after the simulation was paused."""
+        self.accumulator = 0.0
+
+    def should_render(self, update_cost, budget):
+        """
+        Skips drawing while the simulation is behind: this frame's steps
+        alone took the whole budget, or the last frame owed more time than
+        max_catch_up. Never more than max_frame_skip frames in a row. A
+        slow draw is no reason, since the frame limiter sleeps out whatever
+        a skipped draw would have saved.
+        """
+        behind = self.capped or update_cost > budget
+        if behind and self.skipped_in_row < self.max_frame_skip:
+            self.skipped_in_row += 1
+            self.skipped_frames += 1
+            return False
+        self.skipped_in_row = 0
+        return True
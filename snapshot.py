@@ -0,0 +1,212 @@
+import os, math, struct, threading, zlib
+from collections import deque
+from events import Event, LISTS
+from logs import LogEntry
+
+SNAPSHOT_VERSION = 1
+MAGIC = b"RVSN"
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "rover_game", "session.snap")
+
+# ----------------------------
+# Binary layout (little-endian)
+# ----------------------------
+# header, then body: state, RNG, counts, string table, events, logs,
+# buffered log records, pending mini-games. Strings (event names, hints,
+# log lines) are stored once in the table and referenced by index.
+HEADER = struct.Struct("<4sHI")  # magic, version, crc32 of the body
+STATE = struct.Struct("<qqqiiiddddddqqIq")
+# seed, tick, event_id_counter, health, score, next_heal_trigger,
+# elapsed, spawn_timer, mission_time, store clock, log owed, rng gauss_next,
+# spawned, dropped_spawns, log capacity, log next_seq
+RNG_STATE = struct.Struct("<625I")  # Mersenne Twister state words
+COUNTS = struct.Struct("<IIIIII")   # strings, string bytes, events, logs, buffered, pending
+EVENT = struct.Struct("<qBbddddiiII")
+# id, list, priority, duration, total_duration, expire_time, deadline,
+# impact, benefit, name, hint
+LOG = struct.Struct("<qIBBB")       # seq, message, color
+RECORD = struct.Struct("<IBBB")     # message, color
+PENDING = struct.Struct("<I")
+
+NONE = math.nan  # stands for None in float fields
+
+def _opt(value):
+    return NONE if value is None else value
+
+def _unopt(value):
+    return None if math.isnan(value) else value
+
+# ----------------------------
+# Serialise / restore
+# ----------------------------
+def dumps(sim):
+    """The whole session state of a Simulation, RNG included, as bytes."""
+    s = sim.state
+    strings = {}
+    ref = lambda text: strings.setdefault(text, len(strings))
+
+    events = [EVENT.pack(ev.id, LISTS.index(list_name), ev.priority, ev.duration, ev.total_duration,
+                         ev.expire_time, _opt(deadline), ev.impact, ev.benefit,
+                         ref(ev.name), ref(ev.category_hint))
+              for list_name, ev, deadline in s.events.dump()]
+    logs = [LOG.pack(entry.seq, ref(entry.message), *entry.color) for entry in s.logs]
+    source = s.log_source
+    buffered = [RECORD.pack(ref(message), *color) for message, color in source.buffer[source.pos:]]
+    pending = [PENDING.pack(ref(reason)) for reason in s.pending_minigames]
+
+    rng_version, words, gauss_next = sim.rng.getstate()
+    table = "\0".join(strings).encode()
+    body = b"".join([
+        STATE.pack(sim.seed, s.tick, s.event_id_counter, s.health, s.score, s.next_heal_trigger,
+                   s.elapsed, s.spawn_timer, _opt(s.mission_time), s.events.clock, source.owed,
+                   _opt(gauss_next), s.spawned, s.dropped_spawns, s.logs.entries.maxlen, s.logs.next_seq),
+        RNG_STATE.pack(*words),
+        COUNTS.pack(len(strings), len(table), len(events), len(logs), len(buffered), len(pending)),
+        table, *events, *logs, *buffered, *pending,
+    ])
+    return HEADER.pack(MAGIC, SNAPSHOT_VERSION, zlib.crc32(body)) + body
+
+def restore(sim, data):
+    """
+    Replaces sim's session with the one in a snapshot. The Simulation's
+    config is kept, so restore into one built with the same SimConfig.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("Snapshot is truncated")
+    magic, version, crc = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a session snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+    body = memoryview(data)[HEADER.size:]
+    if zlib.crc32(body) != crc:
+        raise ValueError("Snapshot is corrupt (checksum mismatch)")
+
+    (seed, tick, event_id_counter, health, score, next_heal_trigger, elapsed, spawn_timer,
+     mission_time, clock, owed, gauss_next, spawned, dropped, log_capacity, log_next_seq) = STATE.unpack_from(body)
+    offset = STATE.size
+    words = RNG_STATE.unpack_from(body, offset)
+    offset += RNG_STATE.size
+    n_strings, table_size, n_events, n_logs, n_buffered, n_pending = COUNTS.unpack_from(body, offset)
+    offset += COUNTS.size
+    strings = bytes(body[offset:offset + table_size]).decode().split("\0") if n_strings else []
+    offset += table_size
+
+    def records(layout, n):
+        nonlocal offset
+        end = offset + layout.size * n
+        items = list(layout.iter_unpack(body[offset:end]))
+        offset = end
+        return items
+
+    rows = []
+    for (event_id, list_index, priority, duration, total_duration, expire_time, deadline,
+         impact, benefit, name, hint) in records(EVENT, n_events):
+        ev = Event(event_id, strings[name], priority, total_duration, expire_time, impact, benefit, strings[hint])
+        ev.duration = duration
+        rows.append((LISTS[list_index], ev, _unopt(deadline)))
+    logs = [LogEntry(seq, strings[message], (r, g, b)) for seq, message, r, g, b in records(LOG, n_logs)]
+    buffered = [(strings[message], (r, g, b)) for message, r, g, b in records(RECORD, n_buffered)]
+    pending = [strings[reason] for (reason,) in records(PENDING, n_pending)]
+
+    sim.reset(_unopt(mission_time), seed)
+    sim.rng.setstate((3, words, _unopt(gauss_next)))
+    s = sim.state
+    s.tick, s.event_id_counter = tick, event_id_counter
+    s.health, s.score, s.next_heal_trigger = health, score, next_heal_trigger
+    s.elapsed, s.spawn_timer = elapsed, spawn_timer
+    s.spawned, s.dropped_spawns = spawned, dropped
+    s.events.load(clock, rows)
+    s.logs.entries = deque(logs, maxlen=log_capacity)
+    s.logs.next_seq = log_next_seq
+    s.log_source.buffer, s.log_source.pos, s.log_source.owed = buffered, 0, owed
+    s.pending_minigames = pending
+    return sim
+
+def write_atomic(path, data):
+    """Writes via a temp file and rename, so a crash never leaves a half-written snapshot."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def save(sim, path):
+    write_atomic(path, dumps(sim))
+
+def load(sim, path):
+    with open(path, "rb") as f:
+        return restore(sim, f.read())
+
+# ----------------------------
+# Background writer
+# ----------------------------
+class SnapshotWriter:
+    """
+    Writes snapshots to one path on a background thread. submit() only
+    hands the bytes over; if the disk falls behind, a pending snapshot is
+    replaced by the newer one instead of queueing up.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.pending = None
+        self.written = 0
+        self.replaced = 0   # snapshots superseded before they were written
+        self.error = None   # last OSError from the writer thread
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, data):
+        with self._cond:
+            if self.pending is not None:
+                self.replaced += 1
+            self.pending = data
+            self._cond.notify_all()
+
+    def flush(self):
+        """Blocks until everything submitted is on disk."""
+        with self._cond:
+            while self.pending is not None or self._busy:
+                self._cond.wait()
+
+    def discard(self):
+        """Drops pending work and deletes the checkpoint, e.g. when the session has ended."""
+        with self._cond:
+            self.pending = None
+            while self._busy:
+                self._cond.wait()
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self.pending is None and not self._closed:
+                    self._cond.wait()
+                if self.pending is None:
+                    return
+                data, self.pending = self.pending, None
+                self._busy = True
+            try:
+                write_atomic(self.path, data)
+                self.written += 1
+            except OSError as exc:
+                self.error = exc
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
@@ -0,0 +1,356 @@
+"""
+Spectator server: mirrors a live station to remote displays (a projector,
+a control-room dashboard) without screen capture.
+
+    python main.py --spectate 8765          # serve the game on localhost:8765
+    python spectator.py localhost:8765      # headless viewer, prints a status line per second
+
+The protocol is newline-delimited JSON over TCP, one message per line:
+
+    {"type": "key", "seq": 12, "tick": ..., "events": {list: [row, ...]}, "logs": [...]}
+    {"type": "delta", "seq": 13, "health": 85, "events": {"incoming": {"set": [row], "del": [id]}}, "logs": [...]}
+
+Event rows are [id, name, hint, priority, timer] and log lines are
+[seq, message, [r, g, b]]. A keyframe is the whole picture; a delta only
+carries scalars that changed, rows added or changed per list, ids that
+left a list and new log lines. New rows go to the end of their list, as in
+the game. Viewers get a keyframe when they join, every keyframe_interval
+seconds and whenever they fell behind.
+"""
+import sys, json, time, socket, asyncio, argparse, threading
+from collections import deque
+
+from events import LISTS, ACTIVE
+from simulation import MAX_LOGS
+
+PROTOCOL_VERSION = 1
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+SCALARS = ("phase", "seed", "tick", "health", "score", "remaining", "message")
+
+# ----------------------------
+# State capture
+# ----------------------------
+def event_row(ev, list_name):
+    timer = ev.duration if list_name == ACTIVE else ev.expire_time
+    return [ev.id, ev.name, ev.category_hint, ev.priority, round(timer, 1)]
+
+def capture(sim, phase, log_seq=0):
+    """What a viewer sees of sim right now, plus log lines numbered log_seq and up."""
+    s = sim.state
+    return {
+        "phase": phase,
+        "seed": sim.seed,
+        "tick": s.tick,
+        "health": s.health,
+        "score": s.score,
+        "remaining": sim.remaining_time(),
+        "message": s.message,
+        "events": {name: {ev.id: event_row(ev, name) for ev in s.events.events(name)} for name in LISTS},
+        "logs": [[e.seq, e.message, list(e.color)] for e in s.logs if e.seq >= log_seq],
+    }
+
+def diff(old, new):
+    """Delta message body turning old into new, or None if a viewer would see no change."""
+    delta = {name: new[name] for name in SCALARS if new[name] != old[name]}
+    changes = {}
+    for name in LISTS:
+        before, after = old["events"][name], new["events"][name]
+        changed = [row for event_id, row in after.items() if before.get(event_id) != row]
+        gone = [event_id for event_id in before if event_id not in after]
+        if changed or gone:
+            changes[name] = {"set": changed, "del": gone}
+    if changes:
+        delta["events"] = changes
+    if new["logs"]:
+        delta["logs"] = new["logs"]
+    if list(delta) in ([], ["tick"]):
+        return None  # the tick alone moves every frame; not worth a message
+    return delta
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+# ----------------------------
+# Server
+# ----------------------------
+class _Viewer:
+    def __init__(self, writer, max_backlog):
+        self.writer = writer
+        self.queue = asyncio.Queue(max_backlog)
+        self.task = None
+
+
+class SpectatorServer:
+    """
+    Serves viewers from an asyncio loop on its own thread. The game calls
+    publish() every frame; at most rate times a second it copies the visible
+    state (only while someone is watching) and hands it to the loop, which
+    diffs, encodes once and fans the bytes out.
+
+    Each viewer has a send queue of max_backlog messages and a socket send
+    buffer of send_buffer bytes. A viewer whose queue is full has it emptied
+    and replaced by one keyframe, so a slow viewer skips ahead instead of
+    stalling the game or growing memory.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, rate=10, keyframe_interval=5.0, max_backlog=32,
+                 send_buffer=64 * 1024):
+        self.host = host
+        self.port = port
+        self.interval = 1 / rate
+        self.keyframe_interval = keyframe_interval
+        self.max_backlog = max_backlog
+        self.send_buffer = send_buffer
+        self.seq = 0
+        self.sent = 0
+        self.keyframes = 0
+        self.resyncs = 0      # times a slow viewer's backlog was replaced by a keyframe
+        self.error = None
+        self._viewers = set()
+        self._frame = None    # last published state (loop thread)
+        self._logs = deque(maxlen=MAX_LOGS)
+        self._next_keyframe = 0.0
+        self._last_publish = -self.interval
+        self._log_seq = 0     # next log line to send (game thread)
+        self._resync = True   # next capture is a full one (game thread)
+        self._session = None  # GameState last captured (game thread)
+        self._loop = None
+        self._server = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="spectator", daemon=True)
+
+    def start(self):
+        """Binds and starts serving; raises OSError if the address is taken."""
+        self._thread.start()
+        self._ready.wait()
+        if self.error:
+            raise self.error
+        return self
+
+    @property
+    def viewers(self):
+        return len(self._viewers)
+
+    def publish(self, sim, phase):
+        """Called from the game loop every frame; cheap when nobody is watching."""
+        now = time.perf_counter()
+        if now - self._last_publish < self.interval:
+            return
+        self._last_publish = now
+        if not self._viewers:
+            self._resync = True
+            return
+        s = sim.state
+        if s is not self._session:
+            self._session = s
+            self._resync = True  # a new session restarts ids and log numbering
+        full, self._resync = self._resync, False
+        frame = capture(sim, phase, 0 if full else self._log_seq)
+        self._log_seq = s.logs.next_seq
+        self._loop.call_soon_threadsafe(self._broadcast, frame, full)
+
+    def stats(self):
+        return {"viewers": self.viewers, "seq": self.seq, "sent": self.sent,
+                "keyframes": self.keyframes, "resyncs": self.resyncs}
+
+    def close(self):
+        if self._loop is None or not self._thread.is_alive():
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    # ---------- Loop thread ----------
+
+    def _run(self):
+        loop = self._loop = asyncio.new_event_loop()
+        try:
+            self._server = loop.run_until_complete(asyncio.start_server(self._serve, self.host, self.port))
+        except OSError as exc:
+            self.error = exc
+            self._ready.set()
+            loop.close()
+            return
+        self.port = self._server.sockets[0].getsockname()[1]  # the real one when port 0 was asked for
+        self._ready.set()
+        loop.run_forever()
+        loop.close()
+
+    async def _shutdown(self):
+        self._server.close()
+        for viewer in list(self._viewers):
+            viewer.task.cancel()
+            viewer.writer.close()
+        self._viewers.clear()
+        await self._server.wait_closed()
+
+    async def _serve(self, reader, writer):
+        # Small buffers make a stalled viewer back up into its queue within a
+        # few messages; left to the OS it would soak up megabytes of stale state
+        writer.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer)
+        writer.transport.set_write_buffer_limits(self.send_buffer)
+        viewer = _Viewer(writer, self.max_backlog)
+        viewer.task = asyncio.current_task()
+        if self._viewers and self._frame is not None:  # otherwise _frame is stale and the next publish sends a keyframe anyway
+            viewer.queue.put_nowait(self._keyframe())
+        self._viewers.add(viewer)
+        sender = asyncio.ensure_future(self._send(viewer))
+        try:
+            while await reader.read(1024):  # viewers don't talk; this just notices hang-ups
+                pass
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            sender.cancel()
+            self._viewers.discard(viewer)
+            writer.close()
+
+    async def _send(self, viewer):
+        try:
+            while True:
+                data = await viewer.queue.get()
+                viewer.writer.write(data)
+                await viewer.writer.drain()  # waits while the socket buffer is over its high-water mark
+                self.sent += 1
+        except ConnectionError:
+            viewer.task.cancel()
+
+    def _keyframe(self):
+        frame = self._frame
+        message = {"type": "key", "version": PROTOCOL_VERSION, "seq": self.seq}
+        message.update((name, frame[name]) for name in SCALARS)
+        message["events"] = {name: list(rows.values()) for name, rows in frame["events"].items()}
+        message["logs"] = list(self._logs)
+        self.keyframes += 1
+        return encode(message)
+
+    def _broadcast(self, frame, full):
+        old, self._frame = self._frame, frame
+        if full:
+            self._logs.clear()
+        self._logs.extend(frame["logs"])
+        now = self._loop.time()
+        if old is None or full or now >= self._next_keyframe:
+            self.seq += 1
+            self._next_keyframe = now + self.keyframe_interval
+            data = self._keyframe()
+            for viewer in self._viewers:
+                self._offer(viewer, data)
+            return
+        delta = diff(old, frame)
+        if delta is None:
+            return
+        self.seq += 1
+        data = encode({"type": "delta", "seq": self.seq, **delta})
+        for viewer in self._viewers:
+            self._offer(viewer, data)
+
+    def _offer(self, viewer, data):
+        try:
+            viewer.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            while not viewer.queue.empty():
+                viewer.queue.get_nowait()
+            viewer.queue.put_nowait(self._keyframe())
+            self.resyncs += 1
+
+# ----------------------------
+# Headless viewer
+# ----------------------------
+class SpectatorClient:
+    """Rebuilds the station from keyframes and deltas."""
+
+    def __init__(self):
+        self.state = None
+        self.seq = None
+        self.keyframes = 0
+        self.deltas = 0
+
+    def apply(self, message):
+        if message["type"] == "key":
+            self.state = {name: message[name] for name in SCALARS}
+            self.state["events"] = {name: {row[0]: row for row in rows} for name, rows in message["events"].items()}
+            self.state["logs"] = deque(message["logs"], maxlen=MAX_LOGS)
+            self.keyframes += 1
+        elif self.state is None:
+            return  # joined mid-stream; wait for a keyframe
+        else:
+            if message["seq"] != self.seq + 1:
+                raise ValueError(f"Delta {message['seq']} does not follow {self.seq}")
+            for name in SCALARS:
+                if name in message:
+                    self.state[name] = message[name]
+            for name, change in message.get("events", {}).items():
+                rows = self.state["events"][name]
+                for event_id in change["del"]:
+                    del rows[event_id]
+                for row in change["set"]:
+                    rows[row[0]] = row
+            self.state["logs"].extend(message.get("logs", ()))
+            self.deltas += 1
+        self.seq = message["seq"]
+
+    def summary(self):
+        s = self.state
+        if s is None:
+            return "waiting for a keyframe"
+        counts = " ".join(f"{name} {len(rows)}" for name, rows in s["events"].items())
+        last_log = s["logs"][-1][1] if s["logs"] else ""
+        return (f"[{s['phase']}] tick {s['tick']} health {s['health']} score {s['score']} "
+                f"{counts} | {last_log}")
+
+async def watch(host, port, client=None, seconds=None, on_update=None):
+    """Follows a server until it closes or seconds pass. Returns the client."""
+    client = client or SpectatorClient()
+    reader, writer = await asyncio.open_connection(host, port, limit=2**22)
+    deadline = None if seconds is None else time.monotonic() + seconds
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                line = await asyncio.wait_for(reader.readline(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                break
+            client.apply(json.loads(line))
+            if on_update:
+                on_update(client)
+    finally:
+        writer.close()
+    return client
+
+def parse_address(text, default_host=DEFAULT_HOST):
+    """"8765", "host:8765" or "host" -> (host, port)."""
+    host, _, port = text.rpartition(":")
+    if not port.isdigit():
+        return text, DEFAULT_PORT
+    return host or default_host, int(port)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless spectator for a running station")
+    parser.add_argument("address", nargs="?", default=f"{DEFAULT_HOST}:{DEFAULT_PORT}", help="[HOST:]PORT")
+    parser.add_argument("--seconds", type=float, help="stop after this long")
+    parser.add_argument("--every", type=float, default=1.0, help="seconds between status lines")
+    args = parser.parse_args(argv)
+
+    host, port = parse_address(args.address)
+    last = [0.0]
+
+    def report(client):
+        now = time.monotonic()
+        if now - last[0] >= args.every:
+            last[0] = now
+            print(client.summary(), flush=True)
+
+    try:
+        client = asyncio.run(watch(host, port, seconds=args.seconds, on_update=report))
+    except (ConnectionError, OSError) as exc:
+        sys.exit(f"Cannot watch {host}:{port}: {exc}")
+    except KeyboardInterrupt:
+        return
+    print(f"{client.keyframes} keyframes, {client.deltas} deltas")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Synthetic load for the event pipeline.
+
+Ramps the spawn rate through several levels and reports, per level,
+simulation ticks/sec, frame time (with --render), list sizes and memory.
+
+    python stress.py                                  # 1 .. 5000 spawns/s, headless
+    python stress.py --rates 100 1000 --render        # include draw_ui() cost
+    python stress.py --max-incoming 2000 --log-rate 200 --json stress.json
+    python stress.py --rates 1000 20000 --table     # on event_table.EventTable (needs numpy)
+"""
+import os, sys, json, time, argparse, tracemalloc
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from events import EventStore, INCOMING, ACTIVE, QUEUED
+from simulation import Simulation, SimConfig, TICK_RATE
+
+DEFAULT_RATES = (1, 10, 100, 1000, 5000)
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def play(sim, queue_per_tick):
+    """
+    Scripted operator: fills free active slots from the oldest incoming
+    events and queues a few more each tick. Returns the actions.
+    """
+    events = sim.state.events
+    free = sim.config.max_active - events.count(ACTIVE)
+    actions = []
+    for i, ev in enumerate(events.events(INCOMING, free + queue_per_tick)):
+        actions.append(("honor" if i < free else "queue", ev.id))
+    return actions
+
+def run_level(rate, args, render=None, store_factory=EventStore):
+    config = SimConfig(
+        spawn_interval=1 / rate,
+        log_interval=1 / args.log_rate,
+        max_incoming=args.max_incoming,
+        max_queued=args.max_queued,
+        max_active=args.max_active,
+        can_fail=False,
+    )
+    sim = Simulation(None, store_factory=store_factory, seed=args.seed, config=config)
+    if render:
+        render.sim = sim
+        render.invalidate_ui()
+    dt = 1 / TICK_RATE
+    ticks = int(args.seconds * TICK_RATE)
+
+    if args.trace_memory:
+        tracemalloc.start()
+    tick_time = 0.0
+    frame_times = []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        sim.step(dt, play(sim, args.queue_per_tick))
+        sim.resolve_pending()
+        tick_time += time.perf_counter() - start
+        if render:
+            start = time.perf_counter()
+            render.draw_ui()
+            frame_times.append(time.perf_counter() - start)
+
+    events = sim.state.events
+    result = {
+        "store": store_factory.__name__,
+        "spawn_rate": rate,
+        "ticks_per_sec": ticks / tick_time,
+        "tick_us": tick_time / ticks * 1e6,
+        "spawned": sim.state.spawned,
+        "dropped_spawns": sim.state.dropped_spawns,
+        "incoming": events.count(INCOMING),
+        "active": events.count(ACTIVE),
+        "queued": events.count(QUEUED),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if frame_times:
+        frame_times.sort()
+        result["frame_ms_p50"] = frame_times[len(frame_times) // 2] * 1000
+        result["frame_ms_p95"] = frame_times[int(len(frame_times) * 0.95)] * 1000
+    if args.trace_memory:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["traced_mb"] = current / 2**20
+        result["traced_peak_mb"] = peak / 2**20
+    return result
+
+def print_row(result):
+    cells = [f"{k}={v:,.1f}" if isinstance(v, float) else f"{k}={v}" for k, v in result.items()]
+    print("  ".join(cells))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stress the event pipeline at rising spawn rates")
+    parser.add_argument("--rates", type=float, nargs="+", default=DEFAULT_RATES, help="spawns per second")
+    parser.add_argument("--seconds", type=float, default=20, help="simulated seconds per level")
+    parser.add_argument("--log-rate", type=float, default=2, help="log lines per second")
+    parser.add_argument("--max-active", type=int, default=5)
+    parser.add_argument("--max-incoming", type=int, default=None)
+    parser.add_argument("--max-queued", type=int, default=None)
+    parser.add_argument("--queue-per-tick", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--table", action="store_true", help="store events in a NumPy event_table.EventTable")
+    parser.add_argument("--render", action="store_true", help="draw_ui() every tick on a dummy display")
+    parser.add_argument("--trace-memory", action="store_true", help="tracemalloc the run (slower)")
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    render = None
+    if args.render:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import main as render
+        render.init_display()
+
+    store_factory = EventStore
+    if args.table:
+        from event_table import EventTable as store_factory
+
+    results = []
+    for rate in args.rates:
+        result = run_level(rate, args, render, store_factory)
+        print_row(result)
+        results.append(result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Monte Carlo balance sweeps: many headless missions per parameter grid point,
+played by scripted policies across all cores.
+
+    python sweep.py --grid spawn_interval=2,3,4 --grid expire_time=6:16,8:20 --missions 2000
+    python sweep.py --grid honor_minigame_chance=0.1,0.3,0.5 --grid skill=0.5,0.9
+    python sweep.py --out sweep.jsonl --report-only
+
+Grid values are numbers or low:high ranges. Parameters: mission_time,
+skill (chance a mini-game is won), any SimConfig setting and any
+events.EVENT_RANGES key. Every grid point plays the same seeds, so
+differences between points are not seed noise.
+
+Results are appended to --out one chunk of missions per line as they
+finish. Each chunk records the seeds it played and the digest of the event
+catalog, and a run only plays the seeds of its --seed/--missions range not
+already in the file for that point, policy, tick rate and catalog, so an
+interrupted sweep resumes where it stopped and a wider one (or one with
+another --chunk) reuses old work, while results from an edited
+event_catalog.json are played again. Reports cover exactly the seeds asked
+for, under the current catalog.
+"""
+import os, sys, json, random, argparse, itertools
+from events import EVENT_RANGES, INCOMING, ACTIVE, QUEUED, default_catalog
+from simulation import Simulation, SimConfig, MISSION_TIME, TICK_RATE
+
+DEFAULT_SKILL = 0.8  # chance a mini-game is won
+QUEUE_LIMIT = 4      # events triage and the autopilot keep queued, when SimConfig.max_queued allows more
+
+# ----------------------------
+# Scripted players
+# ----------------------------
+def idle(sim):
+    """Never acts; the floor any real player should beat."""
+    return []
+
+def fifo(sim):
+    """Honors the oldest incoming events while there is room, lets the rest expire."""
+    events = sim.state.events
+    free = sim.config.max_active - events.count(ACTIVE)
+    if free <= 0 or not events.count(INCOMING):
+        return []
+    return [("honor", ev.id) for ev in events.events(INCOMING, free)]
+
+def triage(sim):
+    """
+    Honors the highest-impact incoming events, queues the next ones (up to
+    QUEUE_LIMIT) so they cannot expire, and executes queued work whenever a
+    slot is free. Queued events never expire, so an unbounded queue would
+    keep everything and survive any load.
+    """
+    events = sim.state.events
+    cfg = sim.config
+    free = cfg.max_active - events.count(ACTIVE)
+    actions = []
+    if events.count(INCOMING):
+        incoming = sorted(events.events(INCOMING), key=lambda ev: ev.impact, reverse=True)
+        honored = max(free, 0)
+        limit = QUEUE_LIMIT if cfg.max_queued is None else min(QUEUE_LIMIT, cfg.max_queued)
+        room = max(limit - events.count(QUEUED), 0)
+        actions += [("honor", ev.id) for ev in incoming[:honored]]
+        actions += [("queue", ev.id) for ev in incoming[honored:honored + room]]
+        free -= len(incoming)
+    if free > 0 and events.count(QUEUED):
+        actions += [("execute", ev.id) for ev in events.events(QUEUED, free)]
+    return actions
+
+POLICIES = {"idle": idle, "fifo": fifo, "triage": triage}
+
+# ----------------------------
+# Missions
+# ----------------------------
+def make_config(point):
+    """SimConfig for a grid point; event range keys are forced on every catalog template."""
+    overrides = {}
+    ranges = {}
+    for name, value in point.items():
+        if name in EVENT_RANGES:
+            ranges[name] = tuple(value) if isinstance(value, list) else (value, value)
+        elif name not in ("mission_time", "skill"):
+            overrides[name] = tuple(value) if isinstance(value, list) else value
+    return SimConfig(event_ranges=ranges or None, **overrides)
+
+def play_mission(sim, play, seed, skill=DEFAULT_SKILL, tick_rate=TICK_RATE):
+    """
+    Steps sim to game over with play(sim) -> actions as the player, winning
+    each mini-game with chance skill. Shared with autopilot.compare, so
+    both tools play missions the same way.
+    """
+    luck = random.Random(~seed)  # mini-game outcomes, independent of the mission's rng
+    state = sim.state
+    dt = 1 / tick_rate
+    while not state.game_over:
+        sim.step(dt, play(sim))
+        sim.resolve_pending(luck, skill)
+    return state
+
+def run_mission(point, policy, seed, tick_rate=TICK_RATE):
+    """Plays one mission to the end. Returns [survived, score, time_of_failure or None]."""
+    sim = Simulation(point.get("mission_time", MISSION_TIME), seed=seed, config=make_config(point))
+    state = play_mission(sim, POLICIES[policy], seed, point.get("skill", DEFAULT_SKILL), tick_rate)
+    failed = state.health <= 0
+    return [int(not failed), state.score, round(state.elapsed, 2) if failed else None]
+
+def run_chunk(task):
+    """Worker entry point: one chunk of consecutive seeds for one point and policy."""
+    point, policy, first_seed, count, tick_rate = task
+    missions = [run_mission(point, policy, seed, tick_rate) for seed in range(first_seed, first_seed + count)]
+    return {"point": point, "policy": policy, "first_seed": first_seed, "tick_rate": tick_rate,
+            "catalog": default_catalog().digest, "missions": missions}
+
+def group_key(point, policy, tick_rate, catalog):
+    return json.dumps([point, policy, tick_rate, catalog], sort_keys=True)
+
+def played_seeds(chunks):
+    """group_key -> {seed: mission result} over every chunk on disk."""
+    played = {}
+    for chunk in chunks:
+        key = group_key(chunk["point"], chunk["policy"], chunk["tick_rate"], chunk.get("catalog"))
+        missions = played.setdefault(key, {})
+        for offset, mission in enumerate(chunk["missions"]):
+            missions.setdefault(chunk["first_seed"] + offset, mission)
+    return played
+
+def seed_runs(seeds, chunk):
+    """Ascending seeds -> [(first, count)] runs of consecutive seeds, at most chunk long."""
+    runs = []
+    for seed in seeds:
+        if runs and runs[-1][0] + runs[-1][1] == seed and runs[-1][1] < chunk:
+            runs[-1][1] += 1
+        else:
+            runs.append([seed, 1])
+    return [tuple(run) for run in runs]
+
+# ----------------------------
+# Grid & results file
+# ----------------------------
+def parse_value(text):
+    if ":" in text:
+        return [parse_value(part) for part in text.split(":")]
+    number = float(text)
+    return int(number) if number.is_integer() and "." not in text else number
+
+def parse_grid(specs):
+    """["a=1,2", "b=3:4"] -> list of point dicts covering every combination."""
+    axes = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if not values:
+            raise SystemExit(f"Bad --grid entry {spec!r}, expected name=v1,v2,...")
+        axes[name] = [parse_value(v) for v in values.split(",")]
+    for name in axes:
+        if name not in ("mission_time", "skill") and name not in EVENT_RANGES and not hasattr(SimConfig(), name):
+            raise SystemExit(f"Unknown sweep parameter: {name}")
+    if not axes.get("mission_time", [MISSION_TIME])[0]:
+        raise SystemExit("Sweeps need a finite mission_time")
+    names = sorted(axes)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(axes[n] for n in names))]
+
+def load_results(path):
+    """Chunks already on disk. A line cut short by an interrupted run is ignored."""
+    chunks = []
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                try:
+                    chunks.append(json.loads(line))
+                except ValueError:
+                    pass
+    return chunks
+
+# ----------------------------
+# Aggregation
+# ----------------------------
+def percentile(ordered, p):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+def aggregate(chunks, seeds, keys=None):
+    """
+    Per (point, policy, tick rate): survival rate, score distribution and
+    time to failure over the given seeds (each counted once). keys limits
+    the groups to those group_keys.
+    """
+    rows = []
+    for key, played in sorted(played_seeds(chunks).items()):
+        missions = [played[seed] for seed in seeds if seed in played]
+        if not missions or (keys is not None and key not in keys):
+            continue
+        point, policy, tick_rate, _ = json.loads(key)
+        scores = sorted(m[1] for m in missions)
+        failures = sorted(m[2] for m in missions if m[2] is not None)
+        rows.append({
+            "point": point,
+            "policy": policy,
+            "tick_rate": tick_rate,
+            "missions": len(missions),
+            "survival_rate": sum(m[0] for m in missions) / len(missions),
+            "score_mean": sum(scores) / len(scores),
+            "score_p10": percentile(scores, 10),
+            "score_p50": percentile(scores, 50),
+            "score_p90": percentile(scores, 90),
+            "failure_time_p50": percentile(failures, 50),
+            "failure_time_mean": sum(failures) / len(failures) if failures else None,
+        })
+    return rows
+
+def print_report(rows):
+    for row in rows:
+        point = " ".join(f"{k}={v}" for k, v in row["point"].items()) or "defaults"
+        failure = row["failure_time_p50"]
+        print(f"{point:<50} {row['policy']:<7} n={row['missions']:<6} "
+              f"survive={row['survival_rate']:6.1%}  "
+              f"score p10/50/90={row['score_p10']}/{row['score_p50']}/{row['score_p90']}  "
+              f"fail@p50={'-' if failure is None else f'{failure:.0f}s'}")
+
+# ----------------------------
+# Runner
+# ----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo balance sweeps over mission parameters")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2",
+                        help="parameter values to sweep (repeatable)")
+    parser.add_argument("--policies", nargs="+", choices=POLICIES, default=["fifo", "triage"])
+    parser.add_argument("--missions", type=int, default=500, help="missions per point and policy")
+    parser.add_argument("--seed", type=int, default=0, help="first mission seed")
+    parser.add_argument("--chunk", type=int, default=50, help="missions per worker task")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE,
+                        help="simulation steps per second (lower is faster, coarser)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="sweep.jsonl", help="incremental results file")
+    parser.add_argument("--summary", metavar="PATH", help="write the aggregated table as JSON")
+    parser.add_argument("--report-only", action="store_true",
+                        help="aggregate --out without running (every point, the --seed/--missions seeds)")
+    args = parser.parse_args(argv)
+
+    chunks = load_results(args.out)
+    seeds = range(args.seed, args.seed + args.missions)
+    catalog = default_catalog().digest
+    keys = None
+    if args.report_only:
+        chunks = [chunk for chunk in chunks if chunk.get("catalog") == catalog]
+    else:
+        from multiprocessing import Pool
+        played = played_seeds(chunks)
+        groups = [(point, policy) for point in parse_grid(args.grid) for policy in args.policies]
+        keys = {group_key(point, policy, args.tick_rate, catalog) for point, policy in groups}
+        tasks = []
+        reused = 0
+        for point, policy in groups:
+            done = played.get(group_key(point, policy, args.tick_rate, catalog), {})
+            missing = [seed for seed in seeds if seed not in done]
+            reused += len(seeds) - len(missing)
+            tasks += [(point, policy, first, count, args.tick_rate) for first, count in seed_runs(missing, args.chunk)]
+        print(f"{len(tasks)} chunks to run, {reused} missions already in {args.out}")
+        with open(args.out, "a") as out, Pool(args.workers) as pool:
+            for finished, chunk in enumerate(pool.imap_unordered(run_chunk, tasks), 1):
+                out.write(json.dumps(chunk, separators=(",", ":")) + "\n")
+                out.flush()
+                chunks.append(chunk)
+                print(f"\r{finished}/{len(tasks)} chunks", end="", file=sys.stderr, flush=True)
+        if tasks:
+            print(file=sys.stderr)
+
+    rows = aggregate(chunks, seeds, keys)
+    print_report(rows)
+    if args.summary:
+        with open(args.summary, "w") as f:
+            json.dump(rows, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import os, json, time, queue, atexit, sqlite3, threading
+
+# ----------------------------
+# Gameplay telemetry
+# ----------------------------
+_STOP = object()
+
+class TelemetryWriter:
+    """
+    Structured gameplay records, written on a background thread.
+
+    emit() only timestamps the record and puts it on a bounded queue. The
+    writer thread drains the queue in batches to a JSONL file, or to SQLite
+    when the path ends in .db/.sqlite. When the queue is full, records are
+    dropped and counted; with block=True emit() waits up to block_timeout
+    for room first. close() (also registered with atexit, so sys.exit()
+    paths flush too) writes everything still queued.
+    """
+
+    def __init__(self, path, max_queue=10_000, batch_size=500, flush_interval=1.0,
+                 block=False, block_timeout=0.005):
+        self.path = path
+        self.sqlite = path.endswith((".db", ".sqlite"))
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block = block
+        self.block_timeout = block_timeout
+        self.session = None
+        self.emitted = 0
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.error = None  # last storage error from the writer thread
+        self._queue = queue.Queue(max_queue)
+        self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def begin_session(self, seed, **fields):
+        """Tags the following records with a session id and records its start."""
+        self.session = f"{int(time.time())}-{seed}"
+        self.emit("session_start", seed=seed, **fields)
+
+    def emit(self, kind, **fields):
+        record = (time.time(), self.session, kind, fields)
+        self.emitted += 1
+        try:
+            if self.block:
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stats(self):
+        return {
+            "emitted": self.emitted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "queued": self._queue.qsize(),
+        }
+
+    def close(self):
+        """Flushes everything queued and stops the writer. Safe to call twice."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)  # blocks for room rather than losing the tail
+            self._thread.join()
+
+    # ---------- Writer thread ----------
+
+    def _run(self):
+        try:
+            sink = self._open()
+        except (OSError, sqlite3.Error) as exc:
+            self.error = exc  # emit() keeps counting drops once the queue fills
+            return
+        stopping = False
+        while not stopping:
+            batch = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+                while item is not _STOP:
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    item = self._queue.get_nowait()
+                else:
+                    stopping = True
+            except queue.Empty:
+                pass
+            if batch:
+                try:
+                    self._write(sink, batch)
+                    self.written += len(batch)
+                    self.batches += 1
+                except (OSError, sqlite3.Error) as exc:
+                    self.error = exc
+                    self.dropped += len(batch)
+        sink.close()
+
+    def _open(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        if not self.sqlite:
+            return open(self.path, "a", encoding="utf-8")
+        db = sqlite3.connect(self.path)  # owned by this thread
+        db.execute("""CREATE TABLE IF NOT EXISTS telemetry (
+                          time REAL, session TEXT, kind TEXT, data TEXT)""")
+        db.execute("CREATE INDEX IF NOT EXISTS telemetry_session ON telemetry (session, kind)")
+        return db
+
+    def _write(self, sink, batch):
+        if self.sqlite:
+            sink.executemany("INSERT INTO telemetry VALUES (?, ?, ?, ?)",
+                             [(t, session, kind, json.dumps(fields)) for t, session, kind, fields in batch])
+            sink.commit()
+        else:
+            sink.write("".join(json.dumps({"time": t, "session": session, "kind": kind, **fields},
+                                          separators=(",", ":")) + "\n"
+                               for t, session, kind, fields in batch))
+            sink.flush()
@@ -0,0 +1,152 @@
+"""
+Tic-tac-toe rules and a perfect-play table for the mini-game's opponent.
+
+Cells are numbered 0-8 row by row. A board is also kept as a base-3 code,
+cell i adding 3**i times its mark (0 empty, 1 X, 2 O), so the table is a
+flat array indexed by code: entry = 9-bit mask of the best moves for the
+side to move, preferring quicker wins and slower losses. It covers every
+board reachable with X moving first, is solved once (about 10 ms) and
+cached on disk, so picking a move is a lookup.
+
+    python tictactoe.py     # solve, write the cache and print a summary
+"""
+import os, sys, random
+from array import array
+
+EMPTY, X, O = 0, 1, 2
+CELLS = 9
+POW3 = tuple(3 ** i for i in range(CELLS))
+LINES = ((0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6))
+LINES_THROUGH = tuple(tuple(line for line in LINES if cell in line) for cell in range(CELLS))
+
+# Chance the opponent plays a random empty cell instead of a best move
+DIFFICULTIES = {"easy": 1.0, "normal": 0.5, "hard": 0.2, "perfect": 0.0}
+
+TABLE_MAGIC = b"TTT1"
+TABLE_SIZE = 3 ** CELLS
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "rover_game", "tictactoe.bin")
+
+def completes_line(cells, cell):
+    """True if the mark at cell makes three in a row; only the 2-4 lines through it are checked."""
+    mark = cells[cell]
+    return any(cells[a] == mark and cells[b] == mark and cells[c] == mark for a, b, c in LINES_THROUGH[cell])
+
+# ----------------------------
+# Board
+# ----------------------------
+class Board:
+    """A game in progress. play() keeps the code and the winner up to date."""
+
+    def __init__(self):
+        self.cells = [EMPTY] * CELLS
+        self.code = 0
+        self.moves = 0
+        self.winner = None
+
+    def play(self, cell, mark):
+        self.cells[cell] = mark
+        self.code += mark * POW3[cell]
+        self.moves += 1
+        if completes_line(self.cells, cell):
+            self.winner = mark
+        return self.winner
+
+    def empties(self):
+        return [cell for cell in range(CELLS) if self.cells[cell] == EMPTY]
+
+    @property
+    def over(self):
+        return self.winner is not None or self.moves == CELLS
+
+# ----------------------------
+# Perfect-play table
+# ----------------------------
+def solve():
+    """Best-move masks for every board reachable from the empty one (0 = game over or unreachable)."""
+    table = array("H", bytes(2 * TABLE_SIZE))
+    cells = [EMPTY] * CELLS
+    scores = {}
+
+    def negamax(code, mark, empties):
+        # Score for the side to move: +n for a win with n cells still empty, 0 draw, -n loss
+        if code in scores:
+            return scores[code]
+        best, mask = None, 0
+        for cell in range(CELLS):
+            if cells[cell] != EMPTY:
+                continue
+            cells[cell] = mark
+            if completes_line(cells, cell):
+                score = empties
+            elif empties == 1:
+                score = 0
+            else:
+                score = -negamax(code + mark * POW3[cell], 3 - mark, empties - 1)
+            cells[cell] = EMPTY
+            if best is None or score > best:
+                best, mask = score, 1 << cell
+            elif score == best:
+                mask |= 1 << cell
+        scores[code] = best
+        table[code] = mask
+        return best
+
+    negamax(0, X, CELLS)
+    return table
+
+def load_table(path):
+    """The cached table, or None if missing or not a valid table."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if data[:4] != TABLE_MAGIC or len(data) != 4 + 2 * TABLE_SIZE:
+        return None
+    table = array("H")
+    table.frombytes(data[4:])
+    if sys.byteorder == "big":
+        table.byteswap()  # stored little-endian
+    return table
+
+def save_table(table, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    data = array("H", table)
+    if sys.byteorder == "big":
+        data.byteswap()
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(TABLE_MAGIC + data.tobytes())
+    os.replace(tmp, path)
+
+_table = None
+
+def best_moves_table(path=CACHE_PATH):
+    """The table, from memory, the disk cache, or solved now (and cached)."""
+    global _table
+    if _table is None:
+        table = load_table(path)
+        if table is None:
+            table = solve()
+            try:
+                save_table(table, path)
+            except OSError:
+                pass  # fine; solve again next run
+        _table = table
+    return _table
+
+def choose_move(board, difficulty="perfect", rng=random):
+    """The opponent's cell for board at the given difficulty tier."""
+    if rng.random() < DIFFICULTIES[difficulty]:
+        return rng.choice(board.empties())
+    mask = best_moves_table()[board.code]
+    return rng.choice([cell for cell in range(CELLS) if mask >> cell & 1])
+
+if __name__ == "__main__":
+    import time
+    start = time.perf_counter()
+    table = solve()
+    solved = time.perf_counter() - start
+    save_table(table, CACHE_PATH)
+    boards = sum(1 for mask in table if mask)
+    print(f"{boards} boards solved in {solved * 1000:.0f} ms, cached at {CACHE_PATH}")
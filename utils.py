@@ -1,28 +1,12 @@
-import pygame
+import os, pygame
+from collections import OrderedDict
 
 # Window dimensions
 WIDTH, HEIGHT = 1440, 720
 
 # Colors
-
-PRIORITY_COLORS = {
-    0: (100, 100, 100),   # Gray
-    1: (0, 100, 255),     # Blue
-    2: (0, 200, 0),       # Green
-    3: (255, 255, 0),     # Yellow
-    4: (255, 165, 0),     # Orange
-    5: (255, 0, 0)        # Red
-}
-
-WHITE = (255, 255, 255)
-BLACK = (0, 0, 0)
-RED = (200, 0, 0)
-GREEN = (0, 200, 0)
-BLUE = (0, 0, 200)
-YELLOW = (255, 255, 0)
-GRAY = (100, 100, 100)
-ORANGE = (255, 165, 0)
-DARK_GRAY = (40, 40, 40)
+from colors import (PRIORITY_COLORS, WHITE, BLACK, RED, GREEN, BLUE, YELLOW,
+                    GRAY, ORANGE, DARK_GRAY)
 
 def get_contrast_color(bg_color):
     # YIQ brightness formula
@@ -31,8 +15,88 @@ def get_contrast_color(bg_color):
     return (0,0,0) if brightness > 128 else (255,255,255)
 
 # Fonts
+FONT_NAME = "consolas"
+FONT_SIZES = (16, 22, 30, 40, 48, 50, 60, 80)  # every size the UI and mini-games use
+# Resolving FONT_NAME scans the system fonts (fc-list on Linux), so the
+# result is kept on disk and later launches skip the scan
+FONT_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "rover_game", "font_path")
+_fonts = {}
+_font_path = None
+
+def font_path():
+    """File for FONT_NAME, or "" for pygame's default font."""
+    global _font_path
+    if _font_path is None:
+        try:
+            with open(FONT_CACHE) as f:
+                cached = f.read().strip()
+            if not cached or os.path.exists(cached):
+                _font_path = cached
+        except OSError:
+            pass
+    if _font_path is None:
+        _font_path = pygame.font.match_font(FONT_NAME) or ""
+        try:
+            os.makedirs(os.path.dirname(FONT_CACHE), exist_ok=True)
+            with open(FONT_CACHE, "w") as f:
+                f.write(_font_path)
+        except OSError:
+            pass  # read-only home: resolve again next launch
+    return _font_path
+
 def get_font(size=24):
-    return pygame.font.SysFont("consolas", size)
+    """Returns the shared font for a size, loading it on first use."""
+    font = _fonts.get(size)
+    if font is None:
+        font = _fonts[size] = pygame.font.Font(font_path() or None, size)
+    return font
+
+def preload_fonts(sizes=FONT_SIZES):
+    """Loads the font registry up front, so no screen stalls on a first use."""
+    for size in sizes:
+        get_font(size)
+
+# Rendered text cache
+class TextCache:
+    """Bounded LRU of rendered text surfaces keyed by (text, size, color, antialias)."""
+
+    def __init__(self, max_size=512):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, size=24, color=WHITE, antialias=True):
+        key = (text, size, tuple(color), antialias)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = get_font(size).render(text, antialias, color)
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.surfaces),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+text_cache = TextCache()
+
+def render_text(text, size=24, color=WHITE, antialias=True):
+    return text_cache.render(text, size, color, antialias)
 
 # Button utility
 class Button:
@@ -42,15 +106,140 @@ class Button:
         self.action = action
         self.hover = False
 
-    def draw(self, WIN, font):
+    def draw(self, WIN, font_size=22):
         color = BLUE if self.hover else GRAY
         pygame.draw.rect(WIN, color, self.rect)
         pygame.draw.rect(WIN, WHITE, self.rect, 2)
-        text_surf = font.render(self.text, True, WHITE)
+        text_surf = render_text(self.text, font_size, WHITE)
         WIN.blit(text_surf, (self.rect.x + 10, self.rect.y + 5))
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEMOTION:
             self.hover = self.rect.collidepoint(event.pos)
         elif event.type == pygame.MOUSEBUTTONDOWN and self.hover:
-            self.action()
\ No newline at end of file
+            self.action()
+
+# Input routing
+class InputRouter:
+    """
+    Input dispatch for one screen layout, built once per layout: a keymap
+    table plus click targets bucketed into a coarse grid, so a click or
+    mouse move only tests the few rects in its cell.
+    """
+
+    CELL = 64  # grid cell size in pixels
+    WHEEL_BUTTONS = (4, 5)  # pygame also reports wheel steps as button presses
+
+    def __init__(self, keymap=None):
+        self.keymap = dict(keymap or {})  # pygame key -> callback
+        self.cells = {}                   # (col, row) -> [(rect, on_click, hover_target)]
+        self.scrollers = []               # [(rect, on_scroll)]
+        self.hovered = None
+        self.handlers = {
+            pygame.MOUSEBUTTONDOWN: lambda event: event.button not in self.WHEEL_BUTTONS and self.click(event.pos),
+            pygame.MOUSEMOTION: lambda event: self.motion(event.pos),
+            pygame.MOUSEWHEEL: lambda event: self.scroll(pygame.mouse.get_pos(), event.y),
+            pygame.KEYDOWN: lambda event: self.key(event.key),
+        }
+
+    def add(self, rect, on_click, hover=None):
+        """Registers a click target; hover is an object whose .hover flag tracks the mouse."""
+        rect = pygame.Rect(rect)
+        entry = (rect, on_click, hover)
+        c = self.CELL
+        for col in range(rect.left // c, (rect.right - 1) // c + 1):
+            for row in range(rect.top // c, (rect.bottom - 1) // c + 1):
+                self.cells.setdefault((col, row), []).append(entry)
+
+    def add_button(self, button):
+        self.add(button.rect, button.action, button)
+
+    def add_scroll(self, rect, on_scroll):
+        """on_scroll(steps) runs for wheel input over rect; steps > 0 is up."""
+        self.scrollers.append((pygame.Rect(rect), on_scroll))
+
+    def hit(self, pos):
+        for entry in self.cells.get((pos[0] // self.CELL, pos[1] // self.CELL), ()):
+            if entry[0].collidepoint(pos):
+                return entry
+        return None
+
+    def click(self, pos):
+        entry = self.hit(pos)
+        if entry is not None:
+            entry[1]()
+        return entry is not None
+
+    def motion(self, pos):
+        """Moves the hover flag to whatever is under pos. Returns True if it changed."""
+        entry = self.hit(pos)
+        target = entry[2] if entry is not None else None
+        if target is self.hovered:
+            return False
+        if self.hovered is not None:
+            self.hovered.hover = False
+        if target is not None:
+            target.hover = True
+        self.hovered = target
+        return True
+
+    def scroll(self, pos, steps):
+        for rect, on_scroll in self.scrollers:
+            if rect.collidepoint(pos):
+                on_scroll(steps)
+                return True
+        return False
+
+    def key(self, key):
+        action = self.keymap.get(key)
+        if action is not None:
+            action()
+        return action is not None
+
+    def dispatch(self, event):
+        """Routes one pygame event. Returns True if it did anything."""
+        handler = self.handlers.get(event.type)
+        return handler(event) if handler is not None else False
+
+# Dirty-rectangle rendering
+class Region:
+    """A retained screen area that is only repainted when its content key changes."""
+
+    def __init__(self, rect, draw, background=None):
+        self.rect = pygame.Rect(rect)
+        self.draw = draw  # draw(surface, rect)
+        self.background = background
+        self.key = None
+        self.dirty = True
+
+    def invalidate(self):
+        self.dirty = True
+
+    def refresh(self, surface, key):
+        """Repaints if dirty or the key changed. Returns the rect to update, or None."""
+        if not self.dirty and key == self.key:
+            return None
+        self.key = key
+        self.dirty = False
+        if self.background is not None:
+            # Clip first: pygame over-fills rects that hang off the left edge
+            surface.fill(self.background, self.rect.clip(surface.get_rect()))
+        self.draw(surface, self.rect)
+        return self.rect
+
+def refresh_regions(surface, regions_with_keys):
+    """
+    Repaints changed regions in order and returns their rects for
+    display.update(). A repainted region also dirties any later region
+    it overlaps, so draw order is preserved.
+    """
+    rects = []
+    for i, (region, key) in enumerate(regions_with_keys):
+        rect = region.refresh(surface, key)
+        if rect is None:
+            continue
+        rects.append(rect)
+        for later, _ in regions_with_keys[i+1:]:
+            if later.rect.colliderect(rect):
+                later.invalidate()
+    return rects